@@ -1,16 +1,24 @@
 import pathlib
+import secrets
+import time
 
 import pydantic
 import typer
+import yaml
 from loguru import logger
 from rich.console import Console
 from rich.panel import Panel
 from typing_extensions import Annotated
 
 from anime_presenter.cli.common import ErrorHandlingTyper
+from anime_presenter.clip_export import save_clips
+from anime_presenter.image_export import ExportOptions, ImageFormat, save_to_images
 from anime_presenter.markup import Markup
 from anime_presenter.pdf_building import save_to_pdf
 from anime_presenter.player import Player
+from anime_presenter.presentation import PresentationStructure
+from anime_presenter.remote_control import is_loopback
+from anime_presenter.video import out_of_range_slides, probe_video
 
 console = Console()
 app = ErrorHandlingTyper(rich_markup_mode="rich")
@@ -51,9 +59,44 @@ def show(
             resolve_path=True,
         ),
     ],
+    presenter_view: Annotated[
+        bool,
+        typer.Option(
+            "--presenter-view",
+            help="Show current slide titles, next slide preview and a timer beside the video.",
+        ),
+    ] = False,
+    remote_port: Annotated[
+        int | None,
+        typer.Option("--remote-port", min=0, max=65535, help="Start HTTP/WebSocket remote control on this port."),
+    ] = None,
+    remote_host: Annotated[
+        str,
+        typer.Option(
+            "--remote-host",
+            help="Remote control address, use 0.0.0.0 to accept phones in the LAN, which requires a token.",
+        ),
+    ] = "127.0.0.1",
+    remote_token: Annotated[
+        str | None,
+        typer.Option(
+            "--remote-token",
+            help="Token remote control clients must pass, generated and printed for non-loopback addresses.",
+        ),
+    ] = None,
 ):
     markup = Markup.from_yaml(markup_file)
-    with Player.from_markup(markup).open() as player:
+    remote_address = (remote_host, remote_port) if remote_port is not None else None
+    if remote_address and not remote_token and not is_loopback(remote_host):
+        remote_token = secrets.token_urlsafe(16)
+        console.print(f"Remote control token: [bold]{remote_token}[/bold]")
+
+    with Player.from_markup(
+        markup,
+        presenter_view=presenter_view,
+        remote_address=remote_address,
+        remote_token=remote_token,
+    ).open() as player:
         player.loop()
 
 
@@ -85,3 +128,143 @@ def pdf(
 
     markup = Markup.from_yaml(markup_file)
     save_to_pdf(markup, output_file)
+
+
+@app.command()
+def clips(
+    markup_file: Annotated[
+        pathlib.Path,
+        typer.Argument(
+            exists=True,
+            file_okay=True,
+            dir_okay=False,
+            writable=False,
+            readable=True,
+            resolve_path=True,
+        ),
+    ],
+    output_dir: Annotated[
+        pathlib.Path,
+        typer.Argument(
+            file_okay=False,
+            dir_okay=True,
+            writable=True,
+            resolve_path=True,
+        ),
+    ],
+    workers: Annotated[
+        int | None,
+        typer.Option(
+            "--workers",
+            "-w",
+            min=1,
+            help="Number of clip encoding threads for the OpenCV fallback. Defaults to CPU count.",
+        ),
+    ] = None,
+):
+    """
+    Cut the source video into one clip per slide.
+
+    With ffmpeg in PATH clips are H.264/AAC MP4 with audio, ready for publishing.
+    [bold]Without ffmpeg[/bold] OpenCV is used as a fallback: clips have no audio
+    and are MPEG-4 Part 2, which most browsers and LMSes can't play.
+    """
+    markup = Markup.from_yaml(markup_file)
+    paths = save_clips(markup, output_dir, workers=workers)
+    console.print(f"Saved {len(paths)} clips to {output_dir}")
+
+
+@app.command()
+def export_images(
+    markup_file: Annotated[
+        pathlib.Path,
+        typer.Argument(
+            exists=True,
+            file_okay=True,
+            dir_okay=False,
+            writable=False,
+            readable=True,
+            resolve_path=True,
+        ),
+    ],
+    output_dir: Annotated[
+        pathlib.Path,
+        typer.Argument(
+            file_okay=False,
+            dir_okay=True,
+            writable=True,
+            resolve_path=True,
+        ),
+    ],
+    image_format: Annotated[ImageFormat, typer.Option("--format", "-f")] = ImageFormat.png,
+    quality: Annotated[int, typer.Option("--quality", "-q", min=1, max=100, help="JPEG/WebP quality.")] = 90,
+    width: Annotated[int | None, typer.Option("--width", min=1, help="Page width. Defaults to 1920.")] = None,
+    height: Annotated[int | None, typer.Option("--height", min=1, help="Page height. Defaults to 1080.")] = None,
+    workers: Annotated[
+        int | None,
+        typer.Option("--workers", "-w", min=1, help="Number of page encoding threads. Defaults to CPU count."),
+    ] = None,
+):
+    size = None
+    if width or height:
+        # Keep Full HD aspect ratio when only one side is given
+        size = (width or round(height * 16 / 9), height or round(width * 9 / 16))
+
+    markup = Markup.from_yaml(markup_file)
+    options = ExportOptions(format=image_format, quality=quality, size=size, workers=workers)
+    stats = save_to_images(markup, output_dir, options)
+    console.print(
+        f"Exported {stats.exported} pages, skipped {stats.skipped} up to date"
+        f" in {stats.elapsed:.2f}s ({stats.pages_per_second:.1f} pages/s)"
+    )
+
+
+@app.command()
+def validate(
+    markup_files: Annotated[
+        list[pathlib.Path],
+        typer.Argument(
+            exists=True,
+            file_okay=True,
+            dir_okay=False,
+            writable=False,
+            readable=True,
+            resolve_path=True,
+        ),
+    ],
+):
+    failed = 0
+    for markup_file in markup_files:
+        started_at = time.perf_counter()
+        try:
+            markup = Markup.from_yaml(markup_file)
+            slides = PresentationStructure.from_markup(markup).get_all_slides()
+            probe = probe_video(markup.src)
+        # TypeError comes from an empty or non-mapping YAML document
+        except (pydantic.ValidationError, yaml.YAMLError, ValueError, TypeError) as e:
+            failed += 1
+            console.print(f"[bold red]FAIL[/bold red] {markup_file}")
+            console.print(Panel(str(e), border_style="red", title=str(markup_file)))
+            continue
+
+        out_of_range = out_of_range_slides(slides, probe)
+        elapsed = time.perf_counter() - started_at
+        summary = (
+            f"{len(slides)} slides, {probe.width}x{probe.height} @ {probe.fps:.2f} fps,"
+            f" {probe.frame_count} frames ({probe.duration:.1f}s), checked in {elapsed:.3f}s"
+        )
+
+        if not out_of_range:
+            console.print(f"[green]OK[/green] {markup_file}: {summary}")
+            continue
+
+        failed += 1
+        console.print(f"[bold red]FAIL[/bold red] {markup_file}: {summary}")
+        for slide in out_of_range:
+            console.print(
+                f"  {slide.section_id}/{slide.slide_id} {slide.section_title} {slide.slide_title}"
+                f" offset {slide.offset} >= {probe.frame_count} frames"
+            )
+
+    if failed:
+        raise typer.Exit(code=1)
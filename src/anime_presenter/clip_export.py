@@ -0,0 +1,159 @@
+"""Cutting the source video into one clip per slide.
+
+When ffmpeg is available in PATH, it cuts the source in a single pass with
+the segment muxer, encoding H.264 video and AAC audio with key frames forced
+on slide boundaries, so clips are ready for publishing.
+
+Otherwise OpenCV is used: the source is decoded once, sequentially, frames are
+streamed into bounded per-clip queues, and every clip is encoded by its own
+worker of a thread pool. The number of clips in flight is limited by the
+number of workers, so memory stays bounded regardless of the video length.
+These clips are video-only MPEG-4 Part 2, which browsers usually can't play.
+"""
+
+import concurrent.futures
+import os
+import pathlib
+import queue
+import shutil
+import subprocess
+import threading
+
+import cv2
+import numpy.typing as nt
+from loguru import logger
+
+from anime_presenter.markup import Markup
+from anime_presenter.presentation import PresentationStructure, Slide
+from anime_presenter.video import VideoProbe, in_range_slides, probe_video, video_capture_wrapper
+
+FRAMES_BUFFER_SIZE = 64
+
+FrameQueueT = queue.Queue[nt.NDArray | None]
+
+
+def _encode_clip(
+    path: pathlib.Path,
+    fps: float,
+    size: tuple[int, int],
+    frames: FrameQueueT,
+    slots: threading.Semaphore,
+) -> int:
+    writer = None
+    written = 0
+    try:
+        writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+        # Drain the queue even if the writer is broken, so the decoder never blocks on it
+        while (frame := frames.get()) is not None:
+            if writer.isOpened():
+                writer.write(frame)
+                written += 1
+    except Exception:
+        while frames.get() is not None:
+            pass
+        raise
+    finally:
+        if writer is not None:
+            writer.release()
+        slots.release()
+
+    if not written:
+        raise RuntimeError(f"Nothing written to {path}")
+
+    logger.debug(f"Clip saved: {path} ({written} frames)")
+    return written
+
+
+def _save_clips_ffmpeg(
+    ffmpeg: str,
+    src: pathlib.Path,
+    slides: list[Slide],
+    probe: VideoProbe,
+    output_dir: pathlib.Path,
+) -> list[pathlib.Path]:
+    # Half a frame before the boundary, so rounding never moves the cut to the next frame
+    cuts = [slide.offset for slide in slides if slide.offset > 0]
+    times = ",".join(f"{(offset - 0.5) / probe.fps:.6f}" for offset in cuts)
+    segment_pattern = output_dir / ".segment-%05d.mp4"
+
+    cmd = [ffmpeg, "-hide_banner", "-loglevel", "error", "-y", "-i", str(src)]
+    cmd += ["-map", "0:v:0", "-map", "0:a:0?", "-c:v", "libx264", "-pix_fmt", "yuv420p", "-c:a", "aac"]
+    if times:
+        cmd += ["-force_key_frames", times, "-f", "segment", "-segment_times", times]
+    else:
+        cmd += ["-f", "segment", "-segment_time", str(probe.duration + 1)]
+    cmd += ["-reset_timestamps", "1", str(segment_pattern)]
+
+    logger.debug(f"Running: {' '.join(cmd)}")
+    subprocess.run(cmd, check=True)
+
+    # Frames before the first slide go to an extra leading segment
+    first_segment = 1 if slides[0].offset > 0 else 0
+    paths = []
+    for index, slide in enumerate(slides, start=first_segment):
+        path = output_dir / f"{slide.file_stem}.mp4"
+        pathlib.Path(str(segment_pattern) % index).replace(path)
+        logger.debug(f"Clip saved: {path}")
+        paths.append(path)
+
+    for leftover in output_dir.glob(".segment-*.mp4"):
+        leftover.unlink()
+
+    return paths
+
+
+def _save_clips_opencv(
+    src: pathlib.Path,
+    starts: dict[int, Slide],
+    probe: VideoProbe,
+    output_dir: pathlib.Path,
+    workers: int,
+) -> list[pathlib.Path]:
+    with video_capture_wrapper(str(src)) as video:
+        slots = threading.Semaphore(workers)
+        futures: dict[concurrent.futures.Future, pathlib.Path] = {}
+        frames: FrameQueueT | None = None
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="clip") as pool:
+            try:
+                for frame_number in range(probe.frame_count):
+                    ret, frame = video.read()
+                    if not ret:
+                        logger.warning(f"Error during reading frame: {frame_number}")
+                        break
+
+                    if slide := starts.get(frame_number):
+                        if frames is not None:
+                            frames.put(None)
+
+                        slots.acquire()
+                        frames = queue.Queue(maxsize=FRAMES_BUFFER_SIZE)
+                        path = output_dir / f"{slide.file_stem}.mp4"
+                        futures[pool.submit(_encode_clip, path, probe.fps, probe.size, frames, slots)] = path
+
+                    if frames is not None:
+                        frames.put(frame)
+            finally:
+                if frames is not None:
+                    frames.put(None)
+
+    for future in futures:
+        future.result()
+
+    return list(futures.values())
+
+
+def save_clips(markup: Markup, output_dir: pathlib.Path, workers: int | None = None) -> list[pathlib.Path]:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    pres = PresentationStructure.from_markup(markup)
+    probe = probe_video(markup.src)
+    slides = in_range_slides(sorted(pres.get_all_slides(), key=lambda s: s.offset), probe)
+    if not slides:
+        return []
+
+    if ffmpeg := shutil.which("ffmpeg"):
+        return _save_clips_ffmpeg(ffmpeg, markup.src, slides, probe, output_dir)
+
+    logger.warning("ffmpeg is not found, clips are saved by OpenCV without audio as MPEG-4 Part 2")
+    starts = {slide.offset: slide for slide in slides}
+    return _save_clips_opencv(markup.src, starts, probe, output_dir, workers or os.cpu_count() or 1)
@@ -0,0 +1,16 @@
+import os
+import pathlib
+import tempfile
+import typing as t
+
+
+def atomic_write(path: pathlib.Path, write: t.Callable[[pathlib.Path], None]) -> None:
+    """Calls `write` with a temporary path next to `path` and moves the result in place, so `path` is never partial."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    tmp_path = pathlib.Path(tmp_name)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
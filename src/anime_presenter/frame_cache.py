@@ -0,0 +1,65 @@
+import collections
+import typing as t
+
+import numpy.typing as nt
+
+KeyT = t.Hashable
+
+
+class FrameCache:
+    """LRU cache of decoded frames, bounded by the total size of frames in bytes and optionally by their number."""
+
+    def __init__(self, max_bytes: int, max_frames: int | None = None) -> None:
+        self.max_bytes = max_bytes
+        self.max_frames = max_frames
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._frames: collections.OrderedDict[KeyT, nt.NDArray] = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __str__(self) -> str:
+        return (
+            f"FrameCache(frames={len(self)}, size={self.size_bytes}/{self.max_bytes}B,"
+            f" hits={self.hits}, misses={self.misses}, hit_rate={self.hit_rate:.2f})"
+        )
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, key: KeyT) -> nt.NDArray | None:
+        frame = self._frames.get(key)
+        if frame is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._frames.move_to_end(key)
+        return frame
+
+    def put(self, key: KeyT, frame: nt.NDArray) -> None:
+        """Stores the frame without copying, so it must not be modified afterwards."""
+        if self._frames.get(key) is frame:
+            self._frames.move_to_end(key)
+            return None
+
+        if frame.nbytes > self.max_bytes:
+            return None
+
+        if (old := self._frames.pop(key, None)) is not None:
+            self.size_bytes -= old.nbytes
+
+        self._frames[key] = frame
+        self.size_bytes += frame.nbytes
+
+        while self.size_bytes > self.max_bytes or (self.max_frames is not None and len(self) > self.max_frames):
+            _, evicted = self._frames.popitem(last=False)
+            self.size_bytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        self._frames.clear()
+        self.size_bytes = 0
@@ -0,0 +1,132 @@
+"""Exporting slide pages as individual image files.
+
+Frames are extracted and resized to the target size on the calling thread,
+while conversion and encoding run on a thread pool. Every page is written
+atomically, and a manifest in the output directory keeps a fingerprint of each
+page, so pages that are already current are not decoded again.
+"""
+
+import concurrent.futures
+import dataclasses
+import enum
+import hashlib
+import json
+import os
+import pathlib
+import time
+
+import cv2
+import numpy.typing as nt
+from loguru import logger
+from PIL import Image
+
+from anime_presenter.files import atomic_write
+from anime_presenter.markup import Markup
+from anime_presenter.pdf_building import FULL_HD, read_slide_frames
+from anime_presenter.presentation import PresentationStructure, Slide
+
+MANIFEST_NAME = ".anime-presenter-pages.json"
+
+
+class ImageFormat(str, enum.Enum):
+    png = "png"
+    jpeg = "jpeg"
+    webp = "webp"
+
+
+@dataclasses.dataclass
+class ExportOptions:
+    format: ImageFormat = ImageFormat.png
+    quality: int = 90  # Ignored by lossless PNG
+    size: tuple[int, int] | None = None  # Full HD by default
+    workers: int | None = None
+
+
+@dataclasses.dataclass
+class ExportStats:
+    exported: int
+    skipped: int
+    elapsed: float
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.exported / self.elapsed if self.elapsed else 0.0
+
+
+def _page_fingerprint(markup: Markup, slide: Slide, options: ExportOptions) -> str:
+    src_stat = markup.src.stat()
+    key = [
+        str(markup.src),
+        src_stat.st_size,
+        src_stat.st_mtime_ns,
+        slide.offset,
+        slide.section_id,
+        slide.slide_id,
+        slide.section_title,
+        slide.slide_title,
+        options.format.value,
+        options.quality,
+        options.size,
+    ]
+    return hashlib.sha1(json.dumps(key).encode()).hexdigest()
+
+
+def _save_page(frame: nt.NDArray, path: pathlib.Path, options: ExportOptions) -> None:
+    image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+    save_kwargs = {} if options.format is ImageFormat.png else {"quality": options.quality}
+    atomic_write(path, lambda tmp_path: image.save(tmp_path, format=options.format.value, **save_kwargs))
+    logger.debug(f"Page saved: {path}")
+
+
+def _load_manifest(path: pathlib.Path) -> dict[str, str]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_to_images(markup: Markup, output_dir: pathlib.Path, options: ExportOptions) -> ExportStats:
+    started_at = time.perf_counter()
+    workers = options.workers or os.cpu_count() or 1
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest = _load_manifest(manifest_path)
+
+    pres = PresentationStructure.from_markup(markup)
+    fingerprints: dict[str, str] = {}
+    stale: list[Slide] = []
+    for slide in sorted(pres.get_all_slides(), key=lambda s: s.offset):
+        name = f"{slide.file_stem}.{options.format.value}"
+        fingerprints[name] = _page_fingerprint(markup, slide, options)
+        if manifest.get(name) != fingerprints[name] or not (output_dir / name).exists():
+            stale.append(slide)
+
+    futures: dict[concurrent.futures.Future, str] = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="page") as pool:
+        for slide, frame in read_slide_frames(markup, stale, options.size or FULL_HD):
+            # Don't let decoded frames pile up if encoding is slower than decoding
+            pending = [f for f in futures if not f.done()]
+            if len(pending) >= 2 * workers:
+                concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+            name = f"{slide.file_stem}.{options.format.value}"
+            futures[pool.submit(_save_page, frame, output_dir / name, options)] = name
+
+    errors = []
+    for future, name in futures.items():
+        if error := future.exception():
+            errors.append(error)
+        else:
+            manifest[name] = fingerprints[name]
+
+    atomic_write(manifest_path, lambda tmp_path: tmp_path.write_text(json.dumps(manifest, indent=2)))
+    if errors:
+        raise errors[0]
+
+    return ExportStats(
+        exported=len(futures),
+        skipped=len(fingerprints) - len(stale),
+        elapsed=time.perf_counter() - started_at,
+    )
@@ -7,6 +7,7 @@ from pydantic import BaseModel, FilePath, NonNegativeInt, model_validator
 
 class Settings(BaseModel):
     mute_audio: bool = True
+    frame_cache_mb: NonNegativeInt = 256  # Memory budget for slide start and recently played frames, 0 to disable
 
 
 class Slide(BaseModel):
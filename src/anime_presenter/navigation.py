@@ -43,6 +43,10 @@ class State(pydantic.BaseModel):
                 return self
 
 
+CommandT = t.Callable[[State, PresentationStructure], tuple[State, int | None]]
+ListenerT = t.Callable[[State], None]
+
+
 def initial_state(struc: PresentationStructure) -> State:
     return State(cur=None, next=struc.get_first_slide())
 
@@ -96,23 +100,47 @@ class Commands:
         new_cur = struc.get_last_slide()
         return State(cur=new_cur, next=None), offset(new_cur)
 
+    def to_slide(slide_number: int) -> CommandT:
+        """Builds a command moving to the slide by its 1-based number across all sections."""
+
+        def to_slide(state: State, struc: PresentationStructure) -> tuple[State, int | None]:
+            new_cur = struc.get_slide_by_number(slide_number)
+            if new_cur is None:
+                return state, None
+
+            return State(cur=new_cur, next=struc.get_next_slide(new_cur.full_id)), offset(new_cur)
+
+        return to_slide
+
 
 class Navigator:
 
     def __init__(self, struc: PresentationStructure) -> None:
         self._struc = struc
+        self._listeners: list[ListenerT] = []
         self.state = initial_state(struc)
 
+    @property
+    def struc(self) -> PresentationStructure:
+        return self._struc
+
+    def subscribe(self, listener: ListenerT) -> None:
+        """The listener is called with the new state in the navigating thread, so it should be fast."""
+        self._listeners.append(listener)
+
+    def _notify(self) -> None:
+        for listener in self._listeners:
+            listener(self.state)
+
     def reset(self) -> None:
         self.state = initial_state(self._struc)
+        self._notify()
 
-    def apply(
-        self,
-        cmd: t.Callable[[State, PresentationStructure], tuple[State, int | None]],
-    ) -> int | None:
+    def apply(self, cmd: CommandT) -> int | None:
         old_state = self.state
         self.state, new_frame = cmd(self.state, self._struc)
 
         logger.debug("{} -> [{}] -> {}".format(old_state, cmd.__name__, self.state))
+        self._notify()
 
         return new_frame
@@ -0,0 +1,275 @@
+"""Slide sorter: a scrollable grid of slide thumbnails.
+
+Thumbnails are produced by a background thread in a single pass over the
+video in offset order. Frames between close offsets are skipped with `grab()`,
+which still decodes them, but saves the color conversion and a seek to the
+previous key frame. The result is persisted in the user cache directory, keyed
+by the video identity, the offsets and the thumbnail width, so later sessions
+load it at once. Frames that can't be read are stored as empty placeholders,
+so such a pass is final too. The grid is available immediately and fills in as
+thumbnails arrive.
+"""
+
+import hashlib
+import io
+import json
+import os
+import pathlib
+import threading
+import zipfile
+
+import cv2
+import numpy as np
+import numpy.typing as nt
+import pygame
+from loguru import logger
+
+from anime_presenter.files import atomic_write
+from anime_presenter.presentation import Slide
+from anime_presenter.video import video_capture_wrapper
+
+THUMBNAIL_WIDTH = 240
+MAX_GRAB_DISTANCE = 250  # Seeking is cheaper than grabbing more frames
+GRID_PADDING = 16
+GRID_BACKGROUND = (16, 16, 16)
+PLACEHOLDER_COLOR = (48, 48, 48)
+SELECTION_COLOR = (255, 200, 0)
+TEXT_COLOR = (255, 255, 255)
+UNREADABLE = np.empty((0, 0, 3), dtype=np.uint8)
+
+
+def cache_dir() -> pathlib.Path:
+    base = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(base) / "anime-presenter" / "thumbnails"
+
+
+class ThumbnailLoader:
+
+    def __init__(self, src_path: pathlib.Path, offsets: list[int], width: int = THUMBNAIL_WIDTH) -> None:
+        self.src_path = src_path
+        self.offsets = sorted(set(offsets))
+        self.width = width
+        self._thumbnails: dict[int, nt.NDArray] = {}
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def cache_file(self) -> pathlib.Path:
+        stat = self.src_path.stat()
+        key = [str(self.src_path.resolve()), stat.st_size, stat.st_mtime_ns, self.offsets, self.width]
+        return cache_dir() / f"{hashlib.sha1(json.dumps(key).encode()).hexdigest()}.npz"
+
+    @property
+    def done(self) -> bool:
+        return len(self._thumbnails) == len(self.offsets)
+
+    @property
+    def cached(self) -> bool:
+        return self.cache_file.exists()
+
+    def open(self) -> "ThumbnailLoader":
+        """Starts loading in the background, does nothing if it is started already."""
+        if self._thread is not None:
+            return self
+
+        self._thread = threading.Thread(target=self._load, name="thumbnails", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is None:
+            return None
+
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def get(self, offset: int) -> nt.NDArray | None:
+        # Dict reads and writes are atomic, no lock is needed for a single writer
+        thumb = self._thumbnails.get(offset)
+        return thumb if thumb is not None and thumb.size else None
+
+    def _load(self) -> None:
+        cache_file = self.cache_file
+        try:
+            with np.load(cache_file) as cached:
+                self._thumbnails.update({int(offset): cached[offset] for offset in cached.files})
+        except (OSError, ValueError, zipfile.BadZipFile):
+            pass
+
+        if self.done:
+            logger.debug(f"Thumbnails loaded from cache: {cache_file}")
+            return None
+
+        self._decode()
+        if self.done:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            buffer = io.BytesIO()
+            np.savez(buffer, **{str(offset): thumb for offset, thumb in self._thumbnails.items()})
+            atomic_write(cache_file, lambda tmp_path: tmp_path.write_bytes(buffer.getvalue()))
+            logger.debug(f"Thumbnails saved to cache: {cache_file}")
+
+    def _decode(self) -> None:
+        with video_capture_wrapper(str(self.src_path)) as video:
+            position = 0  # Index of the frame to be read next
+            for offset in self.offsets:
+                if self._stopped.is_set():
+                    return None
+
+                if offset in self._thumbnails:
+                    continue
+
+                if not 0 <= offset - position <= MAX_GRAB_DISTANCE:
+                    video.set(cv2.CAP_PROP_POS_FRAMES, offset)
+                    position = offset
+
+                while position < offset and video.grab():
+                    position += 1
+
+                ret, frame = video.read()
+                position += 1
+                if not ret:
+                    logger.warning(f"Error during reading thumbnail: {offset}")
+                    self._thumbnails[offset] = UNREADABLE
+                    continue
+
+                height = round(frame.shape[0] * self.width / frame.shape[1])
+                frame = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_AREA)
+                self._thumbnails[offset] = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
+class OverviewGrid:
+    """Grid of all slides, `handle_event` returns the number of the chosen slide."""
+
+    def __init__(self, loader: ThumbnailLoader, slides: list[Slide], aspect_ratio: float) -> None:
+        self._loader = loader
+        self._slides = slides
+        self.thumbnail_size = (loader.width, round(loader.width / aspect_ratio))
+        self._surfaces: dict[int, pygame.Surface] = {}
+        self._labels: dict[int, pygame.Surface] = {}
+        self.active = False
+        self.selected = 1
+        self._scroll = 0
+        self._columns = 1
+        self._rect = pygame.Rect(0, 0, 0, 0)
+
+    def open(self, selected: int) -> None:
+        self._font = pygame.font.Font(None, 22)
+        self.selected = min(max(selected, 1), len(self._slides))
+        self.active = True
+        self._scroll_to_selected()
+
+    def close(self) -> None:
+        self.active = False
+
+    @property
+    def _cell_size(self) -> tuple[int, int]:
+        return (
+            self.thumbnail_size[0] + GRID_PADDING,
+            self.thumbnail_size[1] + self._font.get_linesize() + GRID_PADDING,
+        )
+
+    def _cell_rect(self, number: int) -> pygame.Rect:
+        row, column = divmod(number - 1, self._columns)
+        cell_w, cell_h = self._cell_size
+        return pygame.Rect(
+            self._rect.x + GRID_PADDING + column * cell_w,
+            self._rect.y + GRID_PADDING + row * cell_h - self._scroll,
+            *self.thumbnail_size,
+        )
+
+    def _scroll_to_selected(self) -> None:
+        if not self._rect.h:
+            return None
+
+        cell = self._cell_rect(self.selected)
+        top = cell.y - self._rect.y - GRID_PADDING
+        bottom = cell.bottom + self._cell_size[1] - self.thumbnail_size[1] - self._rect.bottom
+        if top < 0:
+            self._scroll += top
+        elif bottom > 0:
+            self._scroll += bottom
+
+    def _scroll_by(self, delta: int) -> None:
+        rows = (len(self._slides) + self._columns - 1) // self._columns
+        max_scroll = max(0, rows * self._cell_size[1] + GRID_PADDING - self._rect.h)
+        self._scroll = min(max(self._scroll + delta, 0), max_scroll)
+
+    def _select(self, number: int) -> None:
+        self.selected = min(max(number, 1), len(self._slides))
+        self._scroll_to_selected()
+
+    def handle_event(self, event: pygame.event.Event) -> int | None:
+        match (event.type, getattr(event, "key", None)):
+            case (pygame.KEYDOWN, pygame.K_ESCAPE | pygame.K_o):
+                self.close()
+            case (pygame.KEYDOWN, pygame.K_RETURN | pygame.K_KP_ENTER):
+                self.close()
+                return self.selected
+            case (pygame.KEYDOWN, pygame.K_LEFT):
+                self._select(self.selected - 1)
+            case (pygame.KEYDOWN, pygame.K_RIGHT):
+                self._select(self.selected + 1)
+            case (pygame.KEYDOWN, pygame.K_UP):
+                self._select(self.selected - self._columns)
+            case (pygame.KEYDOWN, pygame.K_DOWN):
+                self._select(self.selected + self._columns)
+            case (pygame.KEYDOWN, pygame.K_HOME):
+                self._select(1)
+            case (pygame.KEYDOWN, pygame.K_END):
+                self._select(len(self._slides))
+            case (pygame.MOUSEWHEEL, _):
+                self._scroll_by(-event.y * self._cell_size[1] // 2)
+            case (pygame.MOUSEBUTTONDOWN, _) if event.button == 1:
+                for number in range(1, len(self._slides) + 1):
+                    if self._cell_rect(number).collidepoint(event.pos):
+                        self.close()
+                        return number
+
+        return None
+
+    def _thumbnail(self, number: int) -> pygame.Surface | None:
+        if (surf := self._surfaces.get(number)) is not None:
+            return surf
+
+        thumb = self._loader.get(self._slides[number - 1].offset)
+        if thumb is None:
+            return None
+
+        surf = pygame.image.frombuffer(thumb.tobytes(), thumb.shape[1::-1], "RGB")
+        if surf.get_size() != self.thumbnail_size:
+            surf = pygame.transform.smoothscale(surf, self.thumbnail_size)
+        self._surfaces[number] = surf
+        return surf
+
+    def _label(self, number: int) -> pygame.Surface:
+        if (label := self._labels.get(number)) is None:
+            slide = self._slides[number - 1]
+            text = f"{number}. {slide.section_id}/{slide.slide_id} {slide.slide_title}"
+            label = self._labels[number] = self._font.render(text, True, TEXT_COLOR)
+        return label
+
+    def draw(self, win: pygame.Surface, rect: pygame.Rect) -> None:
+        if rect != self._rect:
+            self._rect = pygame.Rect(rect)
+            self._columns = max(1, (rect.w - GRID_PADDING) // self._cell_size[0])
+            self._scroll_by(0)
+            self._scroll_to_selected()
+
+        win.fill(GRID_BACKGROUND, rect)
+        clip = win.get_clip()
+        win.set_clip(rect)
+        for number in range(1, len(self._slides) + 1):
+            cell = self._cell_rect(number)
+            if cell.bottom + self._font.get_linesize() < rect.y or cell.y > rect.bottom:
+                continue
+
+            if (thumb := self._thumbnail(number)) is not None:
+                win.blit(thumb, cell)
+            else:
+                win.fill(PLACEHOLDER_COLOR, cell)
+
+            if number == self.selected:
+                pygame.draw.rect(win, SELECTION_COLOR, cell.inflate(6, 6), width=3)
+            win.blit(self._label(number), (cell.x, cell.bottom + 4), pygame.Rect(0, 0, cell.w, cell.h))
+        win.set_clip(clip)
@@ -1,7 +1,7 @@
-"""For now only Full HD is supported."""
+"""PDF pages are Full HD, the slide info overlay scales with the frame size."""
 
 import pathlib
-from contextlib import contextmanager
+import typing as t
 
 import cv2
 import numpy.typing as nt
@@ -10,29 +10,25 @@ from PIL import Image
 from rich import print
 
 from anime_presenter.markup import Markup
-from anime_presenter.presentation import PresentationStructure
+from anime_presenter.presentation import PresentationStructure, Slide
+from anime_presenter.video import in_range_slides, probe_video, video_capture_wrapper
 
-
-@contextmanager
-def video_capture_wrapper(*args, **kwargs):
-    try:
-        vid_stream = cv2.VideoCapture(*args, **kwargs)
-        yield vid_stream
-    finally:
-        vid_stream.release()
+FULL_HD = (1920, 1080)
 
 
 def add_slide_info(image: nt.NDArray, slide_number: str, section_title, slide_title) -> nt.NDArray:
     overlay = image.copy()
     output = image.copy()
+    height, width = image.shape[:2]
+    scale = height / 1080  # Layout is designed for Full HD
 
     # Define box properties
-    box_height = 80  # Height of the overlay box
+    box_height = round(80 * scale)  # Height of the overlay box
     alpha = 0.6  # Transparency level (0 = fully transparent, 1 = fully opaque)
 
     # Box coordinates (bottom of the image)
-    box_start = (0, 1080 - box_height)
-    box_end = (1920, 1080)
+    box_start = (0, height - box_height)
+    box_end = (width, height)
 
     # Draw the semi-transparent rectangle
     cv2.rectangle(overlay, box_start, box_end, (0, 0, 0), -1)
@@ -41,8 +37,8 @@ def add_slide_info(image: nt.NDArray, slide_number: str, section_title, slide_ti
     # Text properties
     # font = cv2.FONT_HERSHEY_SIMPLEX
     font = cv2.FONT_HERSHEY_TRIPLEX
-    font_scale = 1
-    font_thickness = 1
+    font_scale = scale
+    font_thickness = max(1, round(scale))
     text_color = (255, 255, 255)  # White text
 
     # Format slide info text
@@ -50,9 +46,9 @@ def add_slide_info(image: nt.NDArray, slide_number: str, section_title, slide_ti
     slide_text = f"{slide_title}"
 
     # Calculate text positions
-    text_x = 30
-    text_y1 = 1080 - box_height + 30  # First line
-    text_y2 = 1080 - box_height + 65  # Second line
+    text_x = round(30 * scale)
+    text_y1 = height - box_height + round(30 * scale)  # First line
+    text_y2 = height - box_height + round(65 * scale)  # Second line
 
     # Draw text on the image
     cv2.putText(
@@ -79,36 +75,44 @@ def add_slide_info(image: nt.NDArray, slide_number: str, section_title, slide_ti
     return output
 
 
-def save_to_pdf(markup: Markup, output_file: pathlib.Path) -> None:
-
-    pres = PresentationStructure.from_markup(markup)
-    with video_capture_wrapper(markup.src) as video:
-        pages = []
-        for slide in sorted(pres.get_all_slides(), key=lambda s: s.offset):
-            if slide.offset >= int(video.get(cv2.CAP_PROP_FRAME_COUNT)):
-                logger.warning(f"Offset out of boundaries: {slide}")
-                continue
+def read_slide_frames(
+    markup: Markup,
+    slides: list[Slide] | None = None,
+    size: tuple[int, int] = FULL_HD,
+) -> t.Iterator[tuple[Slide, nt.NDArray]]:
+    """Yields BGR frames of slides resized to `size` with slide info overlay. All slides by default."""
+    if slides is None:
+        pres = PresentationStructure.from_markup(markup)
+        slides = sorted(pres.get_all_slides(), key=lambda s: s.offset)
 
+    slides = in_range_slides(slides, probe_video(markup.src))
+    with video_capture_wrapper(str(markup.src)) as video:
+        for slide in slides:
             video.set(cv2.CAP_PROP_POS_FRAMES, slide.offset)
             ret, frame = video.read()
             if not ret:
                 logger.warning(f"Error during reading: {slide}")
                 continue
 
-            frame = cv2.resize(frame, (1920, 1080))
+            if frame.shape[1::-1] != size:
+                frame = cv2.resize(frame, size)
             frame = add_slide_info(
                 frame,
                 slide_number=f"{slide.section_id}/{slide.slide_id}",
                 section_title=slide.section_title,
                 slide_title=slide.slide_title,
             )
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            yield slide, frame
 
-            image = Image.fromarray(frame)
-            pages.append(image)
 
-        if not pages:
-            print("[bold red]Alert![/bold red] No frames to save")
-            exit(1)
+def save_to_pdf(markup: Markup, output_file: pathlib.Path) -> None:
+    pages = []
+    for _, frame in read_slide_frames(markup):
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        pages.append(Image.fromarray(frame))
+
+    if not pages:
+        print("[bold red]Alert![/bold red] No frames to save")
+        exit(1)
 
     pages[0].save(output_file, save_all=True, append_images=pages[1:])
@@ -1,23 +1,82 @@
 import pathlib
 import typing as t
 
+import numpy.typing as nt
 import pygame
+from loguru import logger
 from pyvidplayer2 import Video, VideoPlayer
 
+from anime_presenter.frame_cache import FrameCache
 from anime_presenter.markup import Markup, Settings
-from anime_presenter.navigation import Commands, Navigator
+from anime_presenter.navigation import Commands, CommandT, Navigator
+from anime_presenter.overview import OverviewGrid, ThumbnailLoader
 from anime_presenter.presentation import PresentationStructure
+from anime_presenter.presenter_view import PresenterView
+from anime_presenter.remote_control import RemoteControl
+from anime_presenter.video import out_of_range_slides, probe_video
+
+WINDOW_SCREEN_FRACTION = 0.9
+RECENT_FRAMES_SHARE = 4  # A quarter of the frame cache budget keeps the last second of playback
+
+
+def fit_window_size(size: tuple[int, int], screen_size: tuple[int, int]) -> tuple[int, int]:
+    """Scales the window down, keeping its aspect ratio, so it fits on the screen."""
+    scale = min(
+        1.0,
+        screen_size[0] * WINDOW_SCREEN_FRACTION / size[0],
+        screen_size[1] * WINDOW_SCREEN_FRACTION / size[1],
+    )
+    return round(size[0] * scale), round(size[1] * scale)
+
+
+# pyvidplayer2 has no public API for showing a frame decoded elsewhere, so the helpers below are
+# the only code relying on its internals (checked against pyvidplayer2 0.9.25 and 0.9.37). Precise
+# seeking needs `buffer_current`, which 0.9.25 lacks: its `seek_frame` only shows the target frame
+# after playback renders it.
+
+
+def can_seek_precisely(video: Video) -> bool:
+    return hasattr(video, "buffer_current")
+
+
+def seek_to_frame(video: Video, frame: int) -> bool:
+    """Seeks to `frame`, returns whether it is already displayed and kept in `Video.frame_data`."""
+    video.seek_frame(frame)
+    if not can_seek_precisely(video):
+        return False
+
+    video.buffer_current()
+    return True
+
+
+def show_frame_data(video: Video, data: nt.NDArray) -> None:
+    """Displays already decoded data without seeking, the same way `Video.buffer_current` does."""
+    video.frame_data = data
+    video.frame_surf = video._create_frame(data)
 
 
 class Player:
 
     @classmethod
-    def from_markup(cls: t.Type["Player"], markup: Markup) -> "Player":
+    def from_markup(
+        cls: t.Type["Player"],
+        markup: Markup,
+        presenter_view: bool = False,
+        remote_address: tuple[str, int] | None = None,
+        remote_token: str | None = None,
+    ) -> "Player":
+        struc = PresentationStructure.from_markup(markup)
+        for slide in out_of_range_slides(struc.get_all_slides(), probe_video(markup.src)):
+            logger.warning(f"Offset out of boundaries: {slide}")
+
         return cls(
             src_path=markup.src,
             title=markup.title,
-            navigator=Navigator(PresentationStructure.from_markup(markup)),
+            navigator=Navigator(struc),
             settings=markup.settings,
+            presenter_view=presenter_view,
+            remote_address=remote_address,
+            remote_token=remote_token,
         )
 
     def __init__(
@@ -26,12 +85,28 @@ class Player:
         title: str,
         navigator: Navigator,
         settings: Settings,
+        presenter_view: bool = False,
+        remote_address: tuple[str, int] | None = None,
+        remote_token: str | None = None,
     ) -> None:
         self._running = False
         self.src_path = src_path
         self.title = title
         self._navigator = navigator
         self._settings = settings
+        self._presenter_view_enabled = presenter_view
+        self._presenter_view: PresenterView | None = None
+        cache_bytes = settings.frame_cache_mb * 2**20
+        # Landing frames and played frames are kept apart, so playback never evicts slide starts
+        self.recent_frames = FrameCache(max_bytes=cache_bytes // RECENT_FRAMES_SHARE)
+        self.frame_cache = FrameCache(max_bytes=cache_bytes - self.recent_frames.max_bytes)
+        self._recorded_frame_data: nt.NDArray | None = None
+        self._pending_seek: int | None = None
+        self._thumbnails: ThumbnailLoader | None = None
+        self._overview: OverviewGrid | None = None
+        self._remote_address = remote_address
+        self._remote_token = remote_token
+        self._remote: RemoteControl | None = None
 
     def open(self) -> "Player":
         video = Video(
@@ -39,21 +114,61 @@ class Player:
             use_pygame_audio=True,
             no_audio=self._settings.mute_audio,
         )
-        self._win = pygame.display.set_mode(video.original_size, pygame.RESIZABLE)
+        self.recent_frames.max_frames = max(1, round(video.frame_rate))
+        win_size = video.original_size
+        if self._presenter_view_enabled:
+            self._presenter_view = PresenterView(self.src_path, self._navigator, video.original_size).open()
+            win_size = (win_size[0] + self._presenter_view.panel_size[0], win_size[1])
+
+        # Before the first set_mode call it is the desktop size
+        screen = pygame.display.Info()
+        if screen.current_w > 0 and screen.current_h > 0:
+            win_size = fit_window_size(win_size, (screen.current_w, screen.current_h))
+
+        self._win = pygame.display.set_mode(win_size, pygame.RESIZABLE)
         pygame.display.set_caption(self.title)
         self._player = VideoPlayer(
             video=video,
-            rect=(0, 0, *video.original_size),
+            rect=(0, 0, *self._video_area_size),
             interactable=False,
         )
         self._navigator.reset()
+        self._pending_seek = None
+
+        slides = self._navigator.struc.get_all_slides()
+        frame_count = probe_video(self.src_path).frame_count
+        offsets = [slide.offset for slide in slides if slide.offset < frame_count]
+        self._thumbnails = ThumbnailLoader(self.src_path, offsets)
+        # Decoding waits for the first overview opening, so it doesn't compete with playback
+        if self._thumbnails.cached:
+            self._thumbnails.open()
+        self._overview = OverviewGrid(self._thumbnails, slides, aspect_ratio=video.aspect_ratio)
+
+        if self._remote_address:
+            host, port = self._remote_address
+            self._remote = RemoteControl(self._navigator, host=host, port=port, token=self._remote_token).open()
         return self
 
     @property
     def _video(self) -> Video:
         return self._player.get_video()
 
+    @property
+    def _video_area_size(self) -> tuple[int, int]:
+        width, height = self._win.get_size()
+        if self._presenter_view:
+            width = width * 3 // 4
+
+        return width, height
+
     def close(self) -> None:
+        logger.debug(f"Landing frames: {self.frame_cache}, recent frames: {self.recent_frames}")
+        if self._remote:
+            self._remote.close()
+        if self._thumbnails:
+            self._thumbnails.close()
+        if self._presenter_view:
+            self._presenter_view.close()
         self._player.close()
         pygame.quit()
 
@@ -65,7 +180,14 @@ class Player:
 
     def _render(self, events) -> None:
         self._player.update(events)
+        self._record_played_frame()
         self._player.draw(self._win)
+        if self._overview.active:
+            self._overview.draw(self._win, self._player.frame_rect)
+        if self._presenter_view:
+            frame_rect = self._player.frame_rect
+            panel_rect = pygame.Rect(frame_rect.right, 0, self._win.get_width() - frame_rect.right, frame_rect.h)
+            self._presenter_view.draw(self._win, panel_rect)
         pygame.time.wait(16)
         pygame.display.update()
 
@@ -84,14 +206,80 @@ class Player:
             for event in events:
                 self._handle_event(event, events)
 
+            if self._remote:
+                for cmd in self._remote.drain():
+                    self._apply_command(cmd, events)
+
             self._stop_on_slide()
             self._render(events)
 
+    @property
+    def _shown_frame(self) -> int:
+        if self._pending_seek is not None:
+            return self._pending_seek
+
+        # Video.frame is the next frame to be rendered
+        return self._video.frame - 1
+
+    def _cache_current_frame(self, cache: FrameCache) -> None:
+        if self._pending_seek is None and self._video.frame_data is not None:
+            cache.put((self._shown_frame, self._video.current_size), self._video.frame_data)
+
+    def _record_played_frame(self) -> None:
+        # Only newly decoded data, frame data left from before a seek doesn't match the new position
+        if self._video.frame_data is not self._recorded_frame_data:
+            self._recorded_frame_data = self._video.frame_data
+            self._cache_current_frame(self.recent_frames)
+
+    def _show_cached_frame(self, frame: int) -> bool:
+        """Shows the frame from the caches, the actual seek is postponed until playback resumes."""
+        key = (frame, self._video.current_size)
+        data = self.recent_frames.get(key)
+        if data is None:
+            data = self.frame_cache.get(key)
+        if data is None:
+            return False
+
+        self._video.pause()
+        show_frame_data(self._video, data)
+        self._pending_seek = frame
+        return True
+
+    def _apply_pending_seek(self) -> None:
+        if self._pending_seek is None:
+            return None
+
+        frame, self._pending_seek = self._pending_seek, None
+        self._video.seek_frame(frame)
+
+    def _resume(self) -> None:
+        self._apply_pending_seek()
+        self._video.resume()
+
+    def _step_frame(self, step: int) -> None:
+        frame = min(max(self._shown_frame + step, 0), self._video.frame_count - 1)
+        if self._show_cached_frame(frame):
+            return None
+
+        if not can_seek_precisely(self._video):
+            logger.warning("Frame stepping requires pyvidplayer2 0.9.32 or newer")
+            return None
+
+        self._pending_seek = None
+        self._video.pause()
+        seek_to_frame(self._video, frame)
+        self._cache_current_frame(self.frame_cache)
+
     def _move_to_frame(self, frame: int | None, events) -> None:
         if frame is None:
             return None
 
-        self._video.seek_frame(frame)
+        if self._show_cached_frame(frame):
+            return None
+
+        self._pending_seek = None
+        if seek_to_frame(self._video, frame):
+            self._cache_current_frame(self.frame_cache)
 
         # There are some issues with update + pause combination
         # So we need to render frame several times to update it
@@ -101,6 +289,27 @@ class Player:
 
         self._video.pause()
 
+    def _toggle_overview(self) -> None:
+        if self._overview.active:
+            self._overview.close()
+            return None
+
+        self._video.pause()
+        self._thumbnails.open()
+        cur = self._navigator.state.cur
+        self._overview.open(self._navigator.struc.get_slide_number(cur.full_id) if cur else 1)
+
+    def _apply_command(self, cmd: CommandT, events) -> None:
+        frame = self._navigator.apply(cmd)
+        if frame is None and cmd in (Commands.to_prev_slide, Commands.to_prev_section):
+            frame = 0  # Back to the very beginning from the first slide
+        self._move_to_frame(frame, events)
+
+    def _handle_overview_event(self, event, events) -> None:
+        slide_number = self._overview.handle_event(event)
+        if slide_number is not None:
+            self._apply_command(Commands.to_slide(slide_number), events)
+
     def _handle_event(self, event, events):
         event_descr = (
             event.type,
@@ -112,29 +321,33 @@ class Player:
             case (pygame.QUIT, mod, _):
                 self.stop()
             case (pygame.VIDEORESIZE, mod, _):
-                self._player.resize(self._win.get_size())
+                self._player.resize(self._video_area_size)
+            case (pygame.KEYDOWN | pygame.MOUSEBUTTONDOWN | pygame.MOUSEWHEEL, _, _) if self._overview.active:
+                self._handle_overview_event(event, events)
+            case (pygame.KEYDOWN, pygame.KMOD_NONE, pygame.K_o):
+                self._toggle_overview()
             case (pygame.KEYDOWN, pygame.KMOD_NONE, pygame.K_z):
                 self._player.toggle_zoom()
             case (pygame.KEYDOWN, pygame.KMOD_NONE, pygame.K_q):
                 self.stop()
+            case (pygame.KEYDOWN, pygame.KMOD_NONE, pygame.K_t) if self._presenter_view:
+                self._presenter_view.reset_timer()
             case (pygame.KEYDOWN, pygame.KMOD_NONE, pygame.K_SPACE):
                 if self._navigator.state.next:  # Stop on the last slide
-                    self._video.resume()
+                    self._resume()
+            case (pygame.KEYDOWN, pygame.KMOD_NONE, pygame.K_COMMA):
+                self._step_frame(-1)
+            case (pygame.KEYDOWN, pygame.KMOD_NONE, pygame.K_PERIOD):
+                self._step_frame(1)
             case (pygame.KEYDOWN, pygame.KMOD_NONE, pygame.K_RIGHT):
-                frame = self._navigator.apply(Commands.to_next_slide)
-                self._move_to_frame(frame, events)
+                self._apply_command(Commands.to_next_slide, events)
             case (pygame.KEYDOWN, pygame.KMOD_NONE, pygame.K_LEFT):
-                frame = self._navigator.apply(Commands.to_prev_slide) or 0
-                self._move_to_frame(frame, events)
+                self._apply_command(Commands.to_prev_slide, events)
             case (pygame.KEYDOWN, mod, pygame.K_RIGHT) if mod & pygame.KMOD_SHIFT:
-                frame = self._navigator.apply(Commands.to_next_section)
-                self._move_to_frame(frame, events)
+                self._apply_command(Commands.to_next_section, events)
             case (pygame.KEYDOWN, mod, pygame.K_LEFT) if mod & pygame.KMOD_SHIFT:
-                frame = self._navigator.apply(Commands.to_prev_section) or 0
-                self._move_to_frame(frame, events)
+                self._apply_command(Commands.to_prev_section, events)
             case (pygame.KEYDOWN, pygame.KMOD_NONE, pygame.K_b):
-                frame = self._navigator.apply(Commands.to_first_slide)
-                self._move_to_frame(frame, events)
+                self._apply_command(Commands.to_first_slide, events)
             case (pygame.KEYDOWN, pygame.KMOD_NONE, pygame.K_e):
-                frame = self._navigator.apply(Commands.to_last_slide)
-                self._move_to_frame(frame, events)
+                self._apply_command(Commands.to_last_slide, events)
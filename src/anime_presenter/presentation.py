@@ -1,5 +1,6 @@
 import dataclasses
 import itertools
+import re
 import typing as t
 
 from anime_presenter.markup import Markup
@@ -22,6 +23,11 @@ class Slide:
     def full_id(self) -> SlideIdT:
         return (self.section_id, self.slide_id)
 
+    @property
+    def file_stem(self) -> str:
+        title = re.sub(r"[^\w]+", "-", f"{self.section_title} {self.slide_title}".lower()).strip("-")
+        return f"{self.section_id:02}-{self.slide_id:02}_{title}"
+
 
 def get_next(seq: t.Iterable[T], selector: t.Callable[[t.Any], bool]) -> T | None:
     seq_iter = iter(seq)
@@ -83,6 +89,7 @@ class PresentationStructure:
     def __init__(self, index: IndexT) -> None:
         self._index = index
         self._flat_index: FlatIndexT = {i + 1: k for i, k in enumerate(index.keys())}
+        self._numbers: dict[SlideIdT, int] = {k: i for i, k in self._flat_index.items()}
 
         if not self._flat_index:
             raise ValueError("At least one slide is required")
@@ -97,6 +104,9 @@ class PresentationStructure:
 
         return self._index.get(full_id)
 
+    def get_slide_number(self, full_id: SlideIdT) -> int | None:
+        return self._numbers.get(full_id)
+
     def get_first_slide(self) -> Slide:
         return list(self._index.values())[0]
 
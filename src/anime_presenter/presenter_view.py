@@ -0,0 +1,195 @@
+import collections
+import pathlib
+import queue
+import threading
+import time
+
+import cv2
+import numpy.typing as nt
+import pygame
+from loguru import logger
+
+from anime_presenter.navigation import Navigator, State
+from anime_presenter.presentation import Slide
+from anime_presenter.video import video_capture_wrapper
+
+PANEL_BACKGROUND = (24, 24, 24)
+PANEL_PADDING = 16
+HEADER_COLOR = (150, 150, 150)
+TEXT_COLOR = (255, 255, 255)
+
+
+class StillCache:
+    """Start frames of slides, decoded by a background thread with its own capture.
+
+    The render thread only puts offsets into the queue and picks ready stills,
+    so decoding never happens on the drawing path.
+    """
+
+    def __init__(self, src_path: pathlib.Path, width: int, max_size: int = 8) -> None:
+        self.src_path = src_path
+        self.width = width
+        self.max_size = max_size
+        self._stills: collections.OrderedDict[int, nt.NDArray] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._requests: queue.Queue[int | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+
+    def open(self) -> "StillCache":
+        self._thread = threading.Thread(target=self._decode_loop, name="still-cache", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is None:
+            return None
+
+        self._requests.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def request(self, offset: int) -> None:
+        with self._lock:
+            if offset in self._stills:
+                self._stills.move_to_end(offset)
+                return None
+
+        self._requests.put(offset)
+
+    def get(self, offset: int) -> nt.NDArray | None:
+        with self._lock:
+            return self._stills.get(offset)
+
+    def _decode_loop(self) -> None:
+        with video_capture_wrapper(str(self.src_path)) as video:
+            while (offset := self._requests.get()) is not None:
+                # Only the latest navigation matters, drop outdated requests
+                while not self._requests.empty():
+                    offset = self._requests.get()
+                    if offset is None:
+                        return None
+
+                if self.get(offset) is not None:
+                    continue
+
+                video.set(cv2.CAP_PROP_POS_FRAMES, offset)
+                ret, frame = video.read()
+                if not ret:
+                    logger.warning(f"Error during reading still: {offset}")
+                    continue
+
+                height = round(frame.shape[0] * self.width / frame.shape[1])
+                frame = cv2.resize(frame, (self.width, height), interpolation=cv2.INTER_AREA)
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+                with self._lock:
+                    self._stills[offset] = frame
+                    while len(self._stills) > self.max_size:
+                        self._stills.popitem(last=False)
+
+
+class PresenterView:
+    """Side panel with current slide titles, next slide preview and a timer.
+
+    The panel is rendered into a cached surface and rebuilt only on navigation,
+    when the awaited still arrives or when the timer ticks, so a regular frame
+    costs a single blit.
+    """
+
+    def __init__(self, src_path: pathlib.Path, navigator: Navigator, video_size: tuple[int, int]) -> None:
+        self._navigator = navigator
+        self.panel_size = (video_size[0] // 3, video_size[1])
+        self._stills = StillCache(src_path, width=self.panel_size[0] - 2 * PANEL_PADDING)
+        self._state: State | None = None
+        self._still_surf: pygame.Surface | None = None
+        self._panel: pygame.Surface | None = None
+        self._seconds = -1
+        self._started_at = time.monotonic()
+
+    def open(self) -> "PresenterView":
+        pygame.font.init()
+        self._header_font = pygame.font.Font(None, 28)
+        self._title_font = pygame.font.Font(None, 36)
+        self._timer_font = pygame.font.Font(None, 64)
+        self._stills.open()
+        self.reset_timer()
+        return self
+
+    def close(self) -> None:
+        self._stills.close()
+
+    def reset_timer(self) -> None:
+        self._started_at = time.monotonic()
+        self._panel = None
+
+    def draw(self, win: pygame.Surface, rect: pygame.Rect) -> None:
+        state = self._navigator.state
+        if state is not self._state:
+            self._on_navigation(state)
+
+        if self._still_surf is None and state.next is not None:
+            still = self._stills.get(state.next.offset)
+            if still is not None:
+                self._still_surf = pygame.image.frombuffer(still.tobytes(), still.shape[1::-1], "RGB")
+                self._panel = None
+
+        seconds = int(time.monotonic() - self._started_at)
+        if seconds != self._seconds:
+            self._seconds = seconds
+            self._panel = None
+
+        if self._panel is None or self._panel.get_size() != rect.size:
+            self._panel = self._build_panel(rect.size)
+
+        win.blit(self._panel, rect.topleft)
+
+    def _on_navigation(self, state: State) -> None:
+        self._state = state
+        self._still_surf = None
+        self._panel = None
+        if state.next is not None:
+            self._stills.request(state.next.offset)
+
+    def _build_panel(self, size: tuple[int, int]) -> pygame.Surface:
+        panel = pygame.Surface(size)
+        panel.fill(PANEL_BACKGROUND)
+        width = size[0] - 2 * PANEL_PADDING
+        y = PANEL_PADDING
+
+        y = self._draw_slide_info(panel, "Current", self._state.cur, "Not started", y)
+        y = self._draw_slide_info(panel, "Next", self._state.next, "End of presentation", y + PANEL_PADDING)
+
+        if self._still_surf is not None and width > 0:
+            still_height = round(self._still_surf.get_height() * width / self._still_surf.get_width())
+            panel.blit(pygame.transform.smoothscale(self._still_surf, (width, still_height)), (PANEL_PADDING, y))
+        elif self._state.next is not None:
+            panel.blit(self._header_font.render("Loading preview...", True, HEADER_COLOR), (PANEL_PADDING, y))
+
+        minutes, seconds = divmod(self._seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        timer = self._timer_font.render(f"{hours:02}:{minutes:02}:{seconds:02}", True, TEXT_COLOR)
+        panel.blit(timer, (PANEL_PADDING, size[1] - timer.get_height() - PANEL_PADDING))
+
+        return panel
+
+    def _draw_slide_info(
+        self,
+        panel: pygame.Surface,
+        header: str,
+        slide: Slide | None,
+        placeholder: str,
+        y: int,
+    ) -> int:
+        lines = [(self._header_font, header, HEADER_COLOR)]
+        if slide is None:
+            lines.append((self._title_font, placeholder, TEXT_COLOR))
+        else:
+            lines.append((self._title_font, slide.section_title, TEXT_COLOR))
+            lines.append((self._title_font, slide.slide_title, TEXT_COLOR))
+
+        for font, text, color in lines:
+            surf = font.render(text, True, color)
+            panel.blit(surf, (PANEL_PADDING, y))
+            y += surf.get_height() + 4
+
+        return y + 4
@@ -0,0 +1,374 @@
+"""Local HTTP/WebSocket server for controlling the player remotely.
+
+The server runs an asyncio loop in its own thread. Received commands are
+appended to a deque, which the render loop drains once per frame, so remote
+input never blocks drawing. Navigator state changes are pushed back to all
+WebSocket clients.
+
+HTTP API:
+    GET  /state                       current state
+    POST /commands/<name>[/<number>]  queue a command, e.g. /commands/to_slide/5
+    GET  /ws                          WebSocket, accepts {"command": <name>, "slide_number": <number>}
+                                      and sends {"type": "state", ...} on every state change
+
+WebSocket messages must fit a single frame of at most MAX_WS_PAYLOAD bytes,
+otherwise the connection is closed with 1003 or 1009 status.
+
+Requests sent by web pages of other origins are refused, so a page open in the
+presenter's browser can't drive the talk. When a token is set, and it is
+required for non-loopback addresses, every request must pass it either as
+`Authorization: Bearer <token>` or as `?token=<token>`, since browsers can't
+set headers of WebSocket handshakes.
+"""
+
+import asyncio
+import base64
+import collections
+import dataclasses
+import hashlib
+import hmac
+import ipaddress
+import json
+import struct
+import threading
+import typing as t
+import urllib.parse
+
+from loguru import logger
+
+from anime_presenter.navigation import Commands, CommandT, Navigator, State
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+WS_TEXT = 0x1
+WS_CLOSE = 0x8
+WS_PING = 0x9
+WS_PONG = 0xA
+WS_CLOSE_UNSUPPORTED = 1003
+WS_CLOSE_TOO_BIG = 1009
+MAX_WS_PAYLOAD = 2**16  # Commands are tiny, anything bigger is a misbehaving client
+SHUTDOWN_TIMEOUT = 1.0
+
+COMMANDS: dict[str, CommandT] = {
+    "to_next_slide": Commands.to_next_slide,
+    "to_prev_slide": Commands.to_prev_slide,
+    "to_next_section": Commands.to_next_section,
+    "to_prev_section": Commands.to_prev_section,
+    "to_first_slide": Commands.to_first_slide,
+    "to_last_slide": Commands.to_last_slide,
+}
+
+
+def parse_command(name: str, slide_number: t.Any = None, slide_count: int | None = None) -> CommandT:
+    if name == "to_slide":
+        try:
+            number = int(slide_number)
+        except (TypeError, ValueError):
+            raise ValueError(f"Slide number is required for {name}, got {slide_number!r}")
+
+        if slide_count is not None and not 1 <= number <= slide_count:
+            raise ValueError(f"Slide number should be from 1 to {slide_count}, got {number}")
+        return Commands.to_slide(number)
+
+    try:
+        return COMMANDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown command: {name}")
+
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def encode_ws_frame(payload: bytes, opcode: int = WS_TEXT, mask: bytes | None = None) -> bytes:
+    """Single unfragmented frame, clients have to mask their frames, servers must not."""
+    header = bytes([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    if len(payload) < 126:
+        header += bytes([mask_bit | len(payload)])
+    elif len(payload) < 2**16:
+        header += bytes([mask_bit | 126]) + struct.pack("!H", len(payload))
+    else:
+        header += bytes([mask_bit | 127]) + struct.pack("!Q", len(payload))
+
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        header += mask
+
+    return header + payload
+
+
+class WebSocketError(Exception):
+
+    def __init__(self, code: int, reason: str) -> None:
+        super().__init__(reason)
+        self.code = code
+
+
+def encode_ws_close(code: int, reason: str = "") -> bytes:
+    return encode_ws_frame(struct.pack("!H", code) + reason.encode(), WS_CLOSE)
+
+
+async def read_ws_frame(reader: asyncio.StreamReader, max_payload: int = MAX_WS_PAYLOAD) -> tuple[int, bytes]:
+    """Reads a single frame, fragmented messages are not supported."""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+
+    if not first & 0x80 or not first & 0x0F:
+        raise WebSocketError(WS_CLOSE_UNSUPPORTED, "Fragmented messages are not supported")
+    if length > max_payload:
+        raise WebSocketError(WS_CLOSE_TOO_BIG, f"Frame is larger than {max_payload} bytes")
+
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+    return first & 0x0F, payload
+
+
+class RemoteControl:
+
+    def __init__(
+        self,
+        navigator: Navigator,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        token: str | None = None,
+    ) -> None:
+        if not token and not is_loopback(host):
+            raise ValueError(f"Remote control on non-loopback address {host} requires a token")
+
+        self._navigator = navigator
+        self.host = host
+        self.port = port
+        self.token = token
+        self._commands: collections.deque[CommandT] = collections.deque()
+        self._state = self._dump_state(navigator.state)
+        self._clients: set[asyncio.Queue[bytes]] = set()
+        self._connections: dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopped: asyncio.Event | None = None
+        self._started = threading.Event()
+        self._thread: threading.Thread | None = None
+        navigator.subscribe(self._on_state)
+
+    def open(self) -> "RemoteControl":
+        self._thread = threading.Thread(target=asyncio.run, args=(self._serve(),), name="remote-control", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._stopped is None:
+            raise OSError(f"Unable to start remote control server on {self.host}:{self.port}")
+
+        logger.info(f"Remote control listens on http://{self.host}:{self.port}")
+        return self
+
+    def close(self) -> None:
+        if self._thread is None:
+            return None
+
+        self._loop.call_soon_threadsafe(self._stopped.set)
+        self._thread.join()
+        self._thread = None
+        self._loop = None
+
+    def drain(self) -> t.Iterator[CommandT]:
+        """Commands received since the last call, to be applied by the render loop."""
+        while True:
+            try:
+                yield self._commands.popleft()
+            except IndexError:
+                return None
+
+    def _dump_state(self, state: State) -> dict[str, t.Any]:
+        struc = self._navigator.struc
+        return {
+            "type": "state",
+            "slide_number": struc.get_slide_number(state.cur.full_id) if state.cur else None,
+            "slide_count": len(struc.get_all_slides()),
+            "cur": dataclasses.asdict(state.cur) if state.cur else None,
+            "next": dataclasses.asdict(state.next) if state.next else None,
+        }
+
+    def _on_state(self, state: State) -> None:
+        self._state = self._dump_state(state)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._publish, self._state)
+
+    def _publish(self, state: dict[str, t.Any]) -> None:
+        frame = encode_ws_frame(json.dumps(state).encode())
+        for client in self._clients:
+            client.put_nowait(frame)
+
+    def _accept(self, name: str, slide_number: t.Any = None) -> None:
+        slide_count = len(self._navigator.struc.get_all_slides())
+        self._commands.append(parse_command(name, slide_number, slide_count))
+
+    async def _serve(self) -> None:
+        try:
+            server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        except OSError as e:
+            logger.error(f"Remote control server failed: {e}")
+            self._started.set()
+            return None
+
+        self.port = server.sockets[0].getsockname()[1]
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._started.set()
+
+        async with server:
+            await self._stopped.wait()
+            # Since Python 3.12 the server waits for open connections on exit, and WebSockets never end
+            # themselves. Closed writers make handlers finish on EOF, only stuck handlers are cancelled
+            server.close()
+            for writer in self._connections.values():
+                writer.close()
+            if self._connections:
+                _, stuck = await asyncio.wait(list(self._connections), timeout=SHUTDOWN_TIMEOUT)
+                for task in stuck:
+                    task.cancel()
+                await asyncio.gather(*stuck, return_exceptions=True)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                key, _, value = line.decode("latin-1").partition(":")
+                headers[key.strip().lower()] = value.strip()
+
+            if content_length := int(headers.get("content-length", 0)):
+                await reader.readexactly(content_length)
+
+            if len(request_line) < 2:
+                return None
+
+            method, url = request_line[0], urllib.parse.urlsplit(request_line[1])
+            path, query = url.path, urllib.parse.parse_qs(url.query)
+            if not self._same_origin(headers):
+                await self._respond(writer, "403 Forbidden", {"error": "Cross-origin requests are not allowed"})
+            elif not self._authorized(headers, query):
+                await self._respond(writer, "401 Unauthorized", {"error": "Invalid or missing token"})
+            elif path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                await self._handle_websocket(reader, writer, headers)
+            else:
+                await self._handle_http(writer, method, path)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+            self._connections.pop(task, None)
+
+    def _same_origin(self, headers: dict[str, str]) -> bool:
+        # Browsers always send Origin for cross-origin requests, other clients usually don't send it at all
+        origin = headers.get("origin")
+        return origin is None or urllib.parse.urlsplit(origin).netloc == headers.get("host")
+
+    def _authorized(self, headers: dict[str, str], query: dict[str, list[str]]) -> bool:
+        if not self.token:
+            return True
+
+        supplied = query.get("token", [""])[0] or headers.get("authorization", "").removeprefix("Bearer ").strip()
+        return hmac.compare_digest(supplied.encode(), self.token.encode())
+
+    async def _handle_http(self, writer: asyncio.StreamWriter, method: str, path: str) -> None:
+        parts = path.strip("/").split("/")
+        match (method, parts):
+            case ("GET", ["state"]):
+                status, body = "200 OK", self._state
+            case ("POST", ["commands", name, *args]) if len(args) <= 1:
+                try:
+                    self._accept(name, *args)
+                    status, body = "202 Accepted", {"accepted": name}
+                except ValueError as e:
+                    status, body = "400 Bad Request", {"error": str(e)}
+            case _:
+                status, body = "404 Not Found", {"error": f"Not found: {method} {path}"}
+
+        await self._respond(writer, status, body)
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: str, body: dict[str, t.Any]) -> None:
+        payload = json.dumps(body).encode()
+        writer.write(
+            f"HTTP/1.1 {status}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n".encode() + payload
+        )
+        await writer.drain()
+
+    async def _handle_websocket(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        headers: dict[str, str],
+    ) -> None:
+        if not (key := headers.get("sec-websocket-key")):
+            await self._respond(writer, "400 Bad Request", {"error": "Sec-WebSocket-Key header is required"})
+            return None
+
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest())
+        writer.write(
+            b"HTTP/1.1 101 Switching Protocols\r\n"
+            b"Upgrade: websocket\r\n"
+            b"Connection: Upgrade\r\n"
+            b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+        )
+
+        outbox: asyncio.Queue[bytes] = asyncio.Queue()
+        outbox.put_nowait(encode_ws_frame(json.dumps(self._state).encode()))
+        self._clients.add(outbox)
+        sender = asyncio.create_task(self._send_frames(writer, outbox))
+        try:
+            while True:
+                try:
+                    opcode, payload = await read_ws_frame(reader)
+                except WebSocketError as e:
+                    outbox.put_nowait(encode_ws_close(e.code, str(e)))
+                    break
+
+                if opcode == WS_TEXT:
+                    outbox.put_nowait(self._handle_ws_message(payload))
+                elif opcode == WS_PING:
+                    outbox.put_nowait(encode_ws_frame(payload, WS_PONG))
+                elif opcode == WS_CLOSE:
+                    outbox.put_nowait(encode_ws_frame(b"", WS_CLOSE))
+                    break
+
+            await outbox.join()
+        finally:
+            self._clients.discard(outbox)
+            sender.cancel()
+
+    def _handle_ws_message(self, payload: bytes) -> bytes:
+        try:
+            message = json.loads(payload)
+            self._accept(message["command"], message.get("slide_number"))
+            response = {"type": "accepted", "command": message["command"]}
+        except (ValueError, KeyError, TypeError) as e:
+            response = {"type": "error", "error": str(e)}
+
+        return encode_ws_frame(json.dumps(response).encode())
+
+    async def _send_frames(self, writer: asyncio.StreamWriter, outbox: asyncio.Queue[bytes]) -> None:
+        while True:
+            frame = await outbox.get()
+            try:
+                writer.write(frame)
+                await writer.drain()
+            except ConnectionError:
+                pass
+            finally:
+                outbox.task_done()
@@ -0,0 +1,70 @@
+import dataclasses
+import functools
+import pathlib
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from anime_presenter.presentation import Slide
+
+
+@contextmanager
+def video_capture_wrapper(*args, **kwargs):
+    try:
+        vid_stream = cv2.VideoCapture(*args, **kwargs)
+        yield vid_stream
+    finally:
+        vid_stream.release()
+
+
+@dataclasses.dataclass(frozen=True)
+class VideoProbe:
+    frame_count: int
+    fps: float
+    width: int
+    height: int
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return (self.width, self.height)
+
+    @property
+    def duration(self) -> float:
+        return self.frame_count / self.fps if self.fps else 0.0
+
+
+@functools.lru_cache(maxsize=128)
+def _probe(path: str, device: int, inode: int, size: int, mtime_ns: int) -> VideoProbe:
+    with video_capture_wrapper(path) as video:
+        if not video.isOpened():
+            raise ValueError(f"Unable to open video: {path}")
+
+        return VideoProbe(
+            frame_count=int(video.get(cv2.CAP_PROP_FRAME_COUNT)),
+            fps=video.get(cv2.CAP_PROP_FPS),
+            width=int(video.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(video.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        )
+
+
+def probe_video(path: pathlib.Path) -> VideoProbe:
+    """Video metadata, opened once per file identity and cached for the process lifetime."""
+    stat = path.stat()
+    return _probe(str(path.resolve()), stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def out_of_range_slides(slides: list[Slide], probe: VideoProbe) -> list[Slide]:
+    offsets = np.fromiter((slide.offset for slide in slides), dtype=np.int64, count=len(slides))
+    return [slides[i] for i in np.flatnonzero(offsets >= probe.frame_count)]
+
+
+def in_range_slides(slides: list[Slide], probe: VideoProbe) -> list[Slide]:
+    """Drops slides beyond the end of the video, reporting all of them before decoding starts."""
+    out_of_range = out_of_range_slides(slides, probe)
+    for slide in out_of_range:
+        logger.warning(f"Offset out of boundaries: {slide}")
+
+    out_of_range_ids = {slide.full_id for slide in out_of_range}
+    return [slide for slide in slides if slide.full_id not in out_of_range_ids]
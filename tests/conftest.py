@@ -11,3 +11,48 @@ def resources(tmp_path: pathlib.Path) -> pathlib.Path:
     copy_tree(src=resources_src, dst=tmp_path)
 
     return tmp_path
+
+
+@pytest.fixture
+def display(monkeypatch: pytest.MonkeyPatch):
+    """Initialized pygame with a headless video driver."""
+    import pygame
+
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+@pytest.fixture
+def video_file(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Synthetic video where every frame is filled with `4 * frame_number` brightness."""
+    import cv2
+    import numpy as np
+
+    path = tmp_path / "video.mp4"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 25, (320, 180))
+    for i in range(60):
+        writer.write(np.full((180, 320, 3), 4 * i, dtype=np.uint8))
+    writer.release()
+
+    return path
+
+
+@pytest.fixture
+def video_markup_file(video_file: pathlib.Path) -> pathlib.Path:
+    markup_file = video_file.parent / "video.yaml"
+    markup_file.write_text(
+        "title: Synthetic\n"
+        f"src: {video_file}\n"
+        "sections:\n"
+        "  - label: First\n"
+        "    slides:\n"
+        "      - offset: 0\n"
+        "      - offset: 10\n"
+        "        label: Second\n"
+        "  - slides:\n"
+        "      - offset: 20\n"
+        "      - offset: 40\n"
+    )
+    return markup_file
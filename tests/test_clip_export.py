@@ -0,0 +1,35 @@
+import pathlib
+import shutil
+
+import cv2
+import pytest
+
+from anime_presenter.clip_export import save_clips
+from anime_presenter.markup import Markup
+
+
+@pytest.mark.parametrize("backend", ["ffmpeg", "opencv"])
+def test_save_clips(video_markup_file: pathlib.Path, tmp_path: pathlib.Path, monkeypatch, backend: str):
+    if backend == "ffmpeg" and not shutil.which("ffmpeg"):
+        pytest.skip("ffmpeg is not installed")
+    if backend == "opencv":
+        monkeypatch.setattr(shutil, "which", lambda _: None)
+
+    markup = Markup.from_yaml(video_markup_file)
+    paths = save_clips(markup, tmp_path / "clips", workers=2)
+
+    assert [p.name for p in paths] == [
+        "01-01_section-1-first-slide-1.mp4",
+        "01-02_section-1-first-slide-2-second.mp4",
+        "02-01_section-2-slide-1.mp4",
+        "02-02_section-2-slide-2.mp4",
+    ]
+    assert sorted(p.name for p in (tmp_path / "clips").iterdir()) == [p.name for p in paths]
+
+    frame_counts = []
+    for path in paths:
+        clip = cv2.VideoCapture(str(path))
+        frame_counts.append(int(clip.get(cv2.CAP_PROP_FRAME_COUNT)))
+        clip.release()
+
+    assert frame_counts == [10, 10, 20, 20]
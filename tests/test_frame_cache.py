@@ -0,0 +1,46 @@
+import numpy as np
+
+from anime_presenter.frame_cache import FrameCache
+
+
+def frame(value: int) -> np.ndarray:
+    return np.full((10, 10, 3), value, dtype=np.uint8)  # 300 bytes
+
+
+def test_frame_cache_lru_budget():
+    cache = FrameCache(max_bytes=1000)
+    for i in range(3):
+        cache.put(i, frame(i))
+
+    assert cache.get(0)[0, 0, 0] == 0  # 0 becomes the most recent
+    cache.put(3, frame(3))
+
+    assert len(cache) == 3
+    assert cache.size_bytes == 900
+    assert cache.get(1) is None
+    assert [cache.get(i)[0, 0, 0] for i in (0, 2, 3)] == [0, 2, 3]
+    assert (cache.hits, cache.misses) == (4, 1)
+
+    cache.put(4, np.zeros(2000, dtype=np.uint8))
+    assert cache.get(4) is None
+    assert cache.size_bytes == 900
+
+
+def test_frame_cache_replace():
+    cache = FrameCache(max_bytes=1000)
+    cache.put(0, frame(0))
+    cache.put(0, frame(1))
+
+    assert len(cache) == 1
+    assert cache.size_bytes == 300
+    assert cache.get(0)[0, 0, 0] == 1
+
+
+def test_frame_cache_max_frames():
+    cache = FrameCache(max_bytes=1000, max_frames=2)
+    for i in range(3):
+        cache.put(i, frame(i))
+
+    assert len(cache) == 2
+    assert cache.size_bytes == 600
+    assert cache.get(0) is None
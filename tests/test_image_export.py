@@ -0,0 +1,36 @@
+import pathlib
+
+from PIL import Image
+
+from anime_presenter.image_export import ExportOptions, ImageFormat, save_to_images
+from anime_presenter.markup import Markup
+
+
+def test_save_to_images(video_markup_file: pathlib.Path, tmp_path: pathlib.Path):
+    markup = Markup.from_yaml(video_markup_file)
+    output_dir = tmp_path / "pages"
+    options = ExportOptions(format=ImageFormat.jpeg, quality=80, size=(640, 360), workers=2)
+
+    stats = save_to_images(markup, output_dir, options)
+    assert (stats.exported, stats.skipped) == (4, 0)
+
+    pages = sorted(output_dir.glob("*.jpeg"))
+    assert [p.name for p in pages] == [
+        "01-01_section-1-first-slide-1.jpeg",
+        "01-02_section-1-first-slide-2-second.jpeg",
+        "02-01_section-2-slide-1.jpeg",
+        "02-02_section-2-slide-2.jpeg",
+    ]
+    assert all(Image.open(p).size == (640, 360) for p in pages)
+    assert not list(output_dir.glob("*.tmp"))
+
+    stats = save_to_images(markup, output_dir, options)
+    assert (stats.exported, stats.skipped) == (0, 4)
+
+    pages[0].unlink()
+    stats = save_to_images(markup, output_dir, options)
+    assert (stats.exported, stats.skipped) == (1, 3)
+
+    options.quality = 50
+    stats = save_to_images(markup, output_dir, options)
+    assert (stats.exported, stats.skipped) == (4, 0)
@@ -11,7 +11,7 @@ def test_markup_success(resources: pathlib.Path):
         "title": "My Awesome Presentation",
         "markup_file": markup_file.absolute(),
         "src": (resources / "video.mp4").absolute(),
-        "settings": {"mute_audio": True},
+        "settings": {"mute_audio": True, "frame_cache_mb": 256},
         "sections": [
             {
                 "label": "Introduction",
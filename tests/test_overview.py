@@ -0,0 +1,90 @@
+import pathlib
+import time
+
+import pygame
+import pytest
+
+from anime_presenter.markup import Markup
+from anime_presenter.overview import OverviewGrid, ThumbnailLoader
+from anime_presenter.presentation import PresentationStructure
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+def load_thumbnails(loader: ThumbnailLoader, timeout: float = 5.0) -> ThumbnailLoader:
+    loader.open()
+    deadline = time.monotonic() + timeout
+    while not loader.done and time.monotonic() < deadline:
+        time.sleep(0.01)
+    loader.close()
+    return loader
+
+
+def test_thumbnail_loader(video_file: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    loader = ThumbnailLoader(video_file, [40, 0, 20], width=80)
+    assert not loader.cached
+    thread = loader.open()._thread
+    assert loader.open()._thread is thread  # Opening again doesn't start another pass
+    load_thumbnails(loader)
+
+    assert loader.done
+    assert loader.cached
+    assert loader.get(20).shape == (45, 80, 3)
+    assert abs(loader.get(40).mean() - 160) < 4
+    assert loader.cache_file.exists()
+
+    def no_decode(self):
+        raise AssertionError("Thumbnails should be loaded from the cache")
+
+    monkeypatch.setattr(ThumbnailLoader, "_decode", no_decode)
+    cached = load_thumbnails(ThumbnailLoader(video_file, [0, 20, 40], width=80))
+    assert cached.done
+    assert (cached.get(20) == loader.get(20)).all()
+
+    other = ThumbnailLoader(video_file, [0, 20, 41], width=80)
+    assert other.cache_file != loader.cache_file
+
+
+def test_thumbnail_loader_unreadable_offsets(video_file: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    loader = load_thumbnails(ThumbnailLoader(video_file, [5, 30, 100], width=80))
+
+    assert loader.done
+    assert loader.cached
+    assert loader.get(30) is not None
+    assert loader.get(100) is None
+
+    monkeypatch.setattr(
+        ThumbnailLoader, "_decode", lambda self: pytest.fail("Thumbnails should be loaded from the cache")
+    )
+    cached = load_thumbnails(ThumbnailLoader(video_file, [5, 30, 100], width=80))
+    assert cached.done
+    assert cached.get(100) is None
+
+
+def test_overview_grid_selection(video_markup_file: pathlib.Path, display):
+    win = pygame.display.set_mode((320, 180))
+    markup = Markup.from_yaml(video_markup_file)
+    slides = PresentationStructure.from_markup(markup).get_all_slides()
+    loader = ThumbnailLoader(markup.src, [s.offset for s in slides], width=64)
+    grid = OverviewGrid(loader, slides, aspect_ratio=16 / 9)
+
+    grid.open(selected=2)
+    grid.draw(win, win.get_rect())  # Thumbnails are not loaded yet, placeholders are drawn
+
+    def key(k: int) -> pygame.event.Event:
+        return pygame.event.Event(pygame.KEYDOWN, key=k, mod=pygame.KMOD_NONE)
+
+    assert grid.handle_event(key(pygame.K_RIGHT)) is None
+    assert grid.selected == 3
+    assert grid.handle_event(key(pygame.K_DOWN)) is None  # 3 columns, the last row is incomplete
+    assert grid.selected == 4
+    assert grid.handle_event(key(pygame.K_RETURN)) == 4
+    assert not grid.active
+
+    grid.open(selected=4)
+    click = pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=grid._cell_rect(2).center)
+    assert grid.handle_event(click) == 2
@@ -0,0 +1,23 @@
+import pathlib
+
+import numpy as np
+
+from anime_presenter.markup import Markup
+from anime_presenter.pdf_building import add_slide_info, read_slide_frames
+
+
+def test_add_slide_info_scales_with_image():
+    image = np.full((360, 640, 3), 200, dtype=np.uint8)
+    output = add_slide_info(image, "1/1", "Section", "Slide")
+
+    assert output.shape == image.shape
+    assert (output[: 360 - 27] == 200).all()  # Box height is 80 px at 1080p
+    assert output[-1, -1].max() < 200
+
+
+def test_read_slide_frames_size(video_markup_file: pathlib.Path):
+    markup = Markup.from_yaml(video_markup_file)
+    frames = list(read_slide_frames(markup, size=(640, 360)))
+
+    assert [slide.offset for slide, _ in frames] == [0, 10, 20, 40]
+    assert all(frame.shape == (360, 640, 3) for _, frame in frames)
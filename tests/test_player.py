@@ -0,0 +1,208 @@
+import importlib
+import pathlib
+import statistics
+import sys
+import time
+import types
+import typing as t
+
+import numpy as np
+import pygame
+import pytest
+
+from anime_presenter.markup import Markup
+from anime_presenter.navigation import Commands, Navigator
+from anime_presenter.presentation import PresentationStructure
+from anime_presenter.presenter_view import PresenterView
+
+
+@pytest.fixture
+def player_module(monkeypatch: pytest.MonkeyPatch) -> t.Iterator[types.ModuleType]:
+    """The player module with pyvidplayer2 replaced, so it doesn't need audio libraries."""
+    pyvidplayer2 = types.ModuleType("pyvidplayer2")
+    pyvidplayer2.Video = pyvidplayer2.VideoPlayer = object
+    monkeypatch.setitem(sys.modules, "pyvidplayer2", pyvidplayer2)
+    monkeypatch.delitem(sys.modules, "anime_presenter.player", raising=False)
+    yield importlib.import_module("anime_presenter.player")
+    sys.modules.pop("anime_presenter.player", None)
+
+
+def test_fit_window_size(player_module: types.ModuleType):
+    fit_window_size = player_module.fit_window_size
+
+    assert fit_window_size((1280, 720), (1920, 1080)) == (1280, 720)
+    # Presenter view for a Full HD source doesn't fit a Full HD screen
+    assert fit_window_size((2560, 1080), (1920, 1080)) == (1728, 729)
+    assert fit_window_size((1920, 1080), (1920, 1200)) == (1728, 972)
+
+
+class FakeVideo:
+    """Follows pyvidplayer2 semantics: `frame` is the next frame to be rendered."""
+
+    frame_count = 60
+    current_size = (320, 180)
+
+    def __init__(self) -> None:
+        self.frame = 0
+        self.paused = True
+        self.frame_data = None
+        self.frame_surf = None
+        self.decoded: list[int] = []
+
+    def decode(self, frame: int) -> np.ndarray:
+        self.decoded.append(frame)
+        return np.full((180, 320, 3), frame, dtype=np.uint8)
+
+    def pause(self) -> None:
+        self.paused = True
+
+    def resume(self) -> None:
+        self.paused = False
+
+    def seek_frame(self, index: int) -> None:
+        self.frame = index + 1
+        self.frame_data = self.decode(index)
+
+    def buffer_current(self) -> bool:
+        return False
+
+    def _create_frame(self, data: np.ndarray) -> np.ndarray:
+        return data
+
+    def update(self) -> None:
+        if not self.paused and self.frame < self.frame_count:
+            self.frame_data = self.decode(self.frame)
+            self.frame += 1
+
+
+class FakeVideoPlayer:
+
+    def __init__(self, video: FakeVideo) -> None:
+        self._video = video
+        self.frame_rect = pygame.Rect(0, 0, *video.current_size)
+        self._surface = pygame.Surface(video.current_size)
+
+    def get_video(self) -> FakeVideo:
+        return self._video
+
+    def update(self, events) -> None:
+        self._video.update()
+
+    def draw(self, win: pygame.Surface) -> None:
+        win.blit(self._surface, self.frame_rect)
+
+
+@pytest.fixture
+def player(player_module: types.ModuleType, video_markup_file: pathlib.Path, display):
+    """Player around a fake video, the window has room for the presenter view panel."""
+    markup = Markup.from_yaml(video_markup_file)
+    player = player_module.Player(
+        src_path=markup.src,
+        title=markup.title,
+        navigator=Navigator(PresentationStructure.from_markup(markup)),
+        settings=markup.settings,
+    )
+    player._player = FakeVideoPlayer(FakeVideo())
+    player._win = pygame.display.set_mode((320 + 106, 180))
+    player._overview = types.SimpleNamespace(active=False)
+    return player
+
+
+def test_landing_frames_survive_playback(player):
+    video = player._video
+    player.recent_frames.max_frames = 4  # Playback goes further back than the recent frames
+    player._apply_command(Commands.to_next_slide, [])
+    player._apply_command(Commands.to_next_slide, [])
+    assert player._navigator.state.cur.offset == 10
+
+    player._resume()
+    while not video.paused:
+        player._stop_on_slide()
+        player._render([])
+    assert player._navigator.state.cur.offset == 20
+
+    # Only the slide starts are kept with landing frames, not the frames played in between
+    assert sorted(frame for frame, _ in player.frame_cache._frames) == [0, 10]
+
+    decoded = len(video.decoded)
+    player._apply_command(Commands.to_prev_slide, [])
+    assert len(video.decoded) == decoded
+    assert player.frame_cache.hits == 1
+    assert video.frame_data[0, 0, 0] == 10
+    assert player._shown_frame == 10
+
+
+def test_stepping_back_after_playback(player):
+    video = player._video
+    player._apply_command(Commands.to_next_slide, [])
+    player._resume()
+    while not video.paused:
+        player._stop_on_slide()
+        player._render([])
+    assert player._shown_frame == 9  # Stopped right before the next slide
+
+    decoded = len(video.decoded)
+    player._step_frame(-1)
+    player._step_frame(-1)
+    assert len(video.decoded) == decoded
+    assert player.recent_frames.hits == 2
+    assert video.frame_data[0, 0, 0] == 7
+    assert player._shown_frame == 7
+
+
+class LegacyFakeVideo(FakeVideo):
+    """pyvidplayer2 0.9.25: no `buffer_current`, the target frame is decoded only by playback after seeking."""
+
+    def __getattribute__(self, name: str) -> t.Any:
+        if name == "buffer_current":
+            raise AttributeError(name)
+        return super().__getattribute__(name)
+
+    def seek_frame(self, index: int) -> None:
+        self.frame = index
+
+
+def test_navigation_without_precise_seeking(player):
+    video = player._player._video = LegacyFakeVideo()
+
+    player._apply_command(Commands.to_next_slide, [])
+    player._apply_command(Commands.to_next_slide, [])
+    assert 10 <= video.frame_data[0, 0, 0] < 16  # Rendered after the seek
+    assert len(player.frame_cache) == 0
+
+    frame = video.frame
+    player._step_frame(-1)
+    assert video.frame == frame
+
+
+def test_presenter_view_keeps_render_timing(player, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(pygame.time, "wait", lambda milliseconds: 0)  # Only the render work is timed
+    rebuilds = []
+    build_panel = PresenterView._build_panel
+    monkeypatch.setattr(
+        PresenterView, "_build_panel", lambda view, size: rebuilds.append(size) or build_panel(view, size)
+    )
+
+    def render_frames(count: int = 200) -> list[float]:
+        timings = []
+        for i in range(count):
+            if i % 20 == 0:
+                player._apply_command(Commands.to_next_slide if i % 80 else Commands.to_first_slide, [])
+
+            start = time.perf_counter()
+            player._render([])
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    baseline = render_frames()
+    player._presenter_view = PresenterView(player.src_path, player._navigator, (320, 180)).open()
+    started_at = time.monotonic()
+    try:
+        with_view = render_frames()
+    finally:
+        player._presenter_view.close()
+
+    assert statistics.median(with_view) - statistics.median(baseline) < 0.001
+    # The panel is rebuilt on navigation, when the preview arrives and when the timer ticks, not every frame
+    navigations, ticks = 200 // 20, int(time.monotonic() - started_at) + 1
+    assert len(rebuilds) <= 2 * navigations + ticks
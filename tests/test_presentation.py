@@ -1,6 +1,7 @@
 import pathlib
 
 from anime_presenter.markup import Markup
+from anime_presenter.navigation import Commands, Navigator
 from anime_presenter.presentation import PresentationStructure
 
 
@@ -32,6 +33,9 @@ def test_navigation(resources: pathlib.Path):
     assert presentation.get_slide_by_number(1000) is None
     assert presentation.get_slide_by_number(-1000) is None
 
+    assert presentation.get_slide_number((2, 1)) == 3
+    assert presentation.get_slide_number((100, 1000)) is None
+
     assert presentation.get_next_slide((1, 2)).full_id == (2, 1)
     assert presentation.get_next_slide((2, 3)) is None
 
@@ -42,3 +46,18 @@ def test_navigation(resources: pathlib.Path):
     assert presentation.get_next_section_start(2).full_id == (2, 1)
     assert presentation.get_prev_section_start(2).full_id == (1, 1)
     assert presentation.get_prev_section_start(1).full_id == (1, 1)
+
+
+def test_navigator_to_slide(resources: pathlib.Path):
+    markup_file = resources / "positive_case.yaml"
+    markup = Markup.from_yaml(markup_file)
+    navigator = Navigator(PresentationStructure.from_markup(markup))
+
+    assert navigator.apply(Commands.to_slide(4)) == 300
+    assert (navigator.state.cur.full_id, navigator.state.next.full_id) == ((2, 2), (2, 3))
+
+    assert navigator.apply(Commands.to_slide(1000)) is None
+    assert navigator.state.cur.full_id == (2, 2)
+
+    assert navigator.apply(Commands.to_slide(5)) == 450
+    assert navigator.state.next is None
@@ -0,0 +1,24 @@
+import pathlib
+import time
+
+from anime_presenter.presenter_view import StillCache
+
+
+def wait_for(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if (result := predicate()) is not None:
+            return result
+        time.sleep(0.01)
+
+
+def test_still_cache(video_file: pathlib.Path):
+    stills = StillCache(video_file, width=160).open()
+    try:
+        stills.request(20)
+        still = wait_for(lambda: stills.get(20))
+    finally:
+        stills.close()
+
+    assert still.shape == (90, 160, 3)
+    assert abs(still.mean() - 80) < 4
@@ -0,0 +1,235 @@
+import asyncio
+import base64
+import json
+import os
+import pathlib
+import statistics
+import struct
+import threading
+import time
+
+import pytest
+
+from anime_presenter.markup import Markup
+from anime_presenter.navigation import Navigator
+from anime_presenter.presentation import PresentationStructure
+from anime_presenter.remote_control import (
+    MAX_WS_PAYLOAD,
+    WS_CLOSE,
+    WS_CLOSE_TOO_BIG,
+    WS_CLOSE_UNSUPPORTED,
+    WS_TEXT,
+    RemoteControl,
+    encode_ws_frame,
+    read_ws_frame,
+)
+
+
+@pytest.fixture
+def remote(video_markup_file: pathlib.Path):
+    """Remote control with a render loop imitation, draining commands every 16 ms like the player."""
+    navigator = Navigator(PresentationStructure.from_markup(Markup.from_yaml(video_markup_file)))
+    remote = RemoteControl(navigator, port=0).open()
+    running = True
+
+    def render_loop():
+        while running:
+            for cmd in remote.drain():
+                navigator.apply(cmd)
+            time.sleep(0.016)
+
+    thread = threading.Thread(target=render_loop)
+    thread.start()
+    yield remote
+    running = False
+    thread.join()
+    remote.close()
+
+
+async def raw_request(port: int, method: str, path: str, headers: dict[str, str] | None = None) -> bytes:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    lines = [f"{method} {path} HTTP/1.1", f"Host: 127.0.0.1:{port}"]
+    lines += [f"{key}: {value}" for key, value in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+    response = await reader.read()
+    writer.close()
+    return response
+
+
+async def http_request(port: int, method: str, path: str, headers: dict[str, str] | None = None) -> tuple[int, dict]:
+    head, _, body = (await raw_request(port, method, path, headers)).partition(b"\r\n\r\n")
+    assert b"Access-Control-Allow-Origin" not in head
+    return int(head.split()[1]), json.loads(body)
+
+
+async def handshake_status(port: int, path: str = "/ws", headers: dict[str, str] | None = None) -> int:
+    key = base64.b64encode(os.urandom(16)).decode()
+    headers = {"Upgrade": "websocket", "Connection": "Upgrade", "Sec-WebSocket-Key": key, **(headers or {})}
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    lines = [f"GET {path} HTTP/1.1", f"Host: 127.0.0.1:{port}", *(f"{k}: {v}" for k, v in headers.items())]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+    status = int((await reader.readline()).split()[1])
+    writer.close()
+    return status
+
+
+class WebSocketClient:
+
+    async def connect(self, port: int) -> "WebSocketClient":
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", port)
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.writer.write(
+            "GET /ws HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode()
+        )
+        assert (await self.reader.readuntil(b"\r\n\r\n")).startswith(b"HTTP/1.1 101")
+        return self
+
+    async def send(self, message: dict) -> None:
+        self.writer.write(encode_ws_frame(json.dumps(message).encode(), mask=os.urandom(4)))
+        await self.writer.drain()
+
+    async def send_raw(self, frame: bytes) -> None:
+        self.writer.write(frame)
+        await self.writer.drain()
+
+    async def receive_close(self) -> int:
+        while True:
+            opcode, payload = await read_ws_frame(self.reader)
+            if opcode == WS_CLOSE:
+                return struct.unpack("!H", payload[:2])[0]
+
+    async def receive(self, message_type: str) -> dict:
+        while True:
+            opcode, payload = await read_ws_frame(self.reader)
+            assert opcode == WS_TEXT
+            if (message := json.loads(payload))["type"] == message_type:
+                return message
+
+
+def test_http_commands(remote: RemoteControl):
+    async def scenario():
+        assert await http_request(remote.port, "POST", "/commands/to_slide/3") == (202, {"accepted": "to_slide"})
+        assert (await http_request(remote.port, "POST", "/commands/jump"))[0] == 400
+        for number in (0, 5, 999):
+            status, body = await http_request(remote.port, "POST", f"/commands/to_slide/{number}")
+            assert status == 400
+            assert "from 1 to 4" in body["error"]
+        assert (await http_request(remote.port, "GET", "/nothing"))[0] == 404
+        await asyncio.sleep(0.1)
+        return await http_request(remote.port, "GET", "/state")
+
+    status, state = asyncio.run(scenario())
+    assert status == 200
+    assert (state["slide_number"], state["slide_count"]) == (3, 4)
+    assert state["cur"]["section_title"] == "Section 2."
+
+
+def test_websocket_round_trip_latency(remote: RemoteControl):
+    async def scenario() -> list[float]:
+        client = await WebSocketClient().connect(remote.port)
+        assert (await client.receive("state"))["slide_number"] is None
+
+        latencies = []
+        for i in range(20):
+            command = {"command": "to_slide", "slide_number": i % 4 + 1}
+            started_at = time.perf_counter()
+            await client.send(command)
+            state = await asyncio.wait_for(client.receive("state"), timeout=1)
+            latencies.append(time.perf_counter() - started_at)
+            assert state["slide_number"] == i % 4 + 1
+
+        await client.send({"command": "to_nowhere"})
+        assert "Unknown command" in (await client.receive("error"))["error"]
+        await client.send({"command": "to_slide", "slide_number": 999})
+        assert "from 1 to 4" in (await client.receive("error"))["error"]
+        client.writer.close()
+        return latencies
+
+    latencies = asyncio.run(scenario())
+    print(
+        f"Round trip latency: median {statistics.median(latencies) * 1000:.1f} ms, max {max(latencies) * 1000:.1f} ms"
+    )
+
+    # Bounded by the render loop period rather than by the server
+    assert statistics.median(latencies) < 0.05
+
+
+def test_websocket_rejects_bad_frames(remote: RemoteControl):
+    async def scenario() -> list[int]:
+        codes = []
+        client = await WebSocketClient().connect(remote.port)
+        await client.send_raw(encode_ws_frame(b"x" * (MAX_WS_PAYLOAD + 1), mask=os.urandom(4)))
+        codes.append(await client.receive_close())
+
+        client = await WebSocketClient().connect(remote.port)
+        frame = encode_ws_frame(b'{"command": "to_next_slide"}', mask=os.urandom(4))
+        await client.send_raw(bytes([frame[0] & 0x7F]) + frame[1:])  # FIN bit is cleared
+        codes.append(await client.receive_close())
+        return codes
+
+    assert asyncio.run(scenario()) == [WS_CLOSE_TOO_BIG, WS_CLOSE_UNSUPPORTED]
+
+
+def test_websocket_handshake_without_key(remote: RemoteControl):
+    async def scenario() -> bytes:
+        reader, writer = await asyncio.open_connection("127.0.0.1", remote.port)
+        writer.write(b"GET /ws HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n\r\n")
+        response = await reader.read()
+        writer.close()
+        return response
+
+    assert asyncio.run(scenario()).startswith(b"HTTP/1.1 400")
+
+
+def test_cross_origin_requests_are_refused(remote: RemoteControl):
+    async def scenario() -> list[int]:
+        foreign = {"Origin": "https://example.com"}
+        own = {"Origin": f"http://127.0.0.1:{remote.port}"}
+        return [
+            (await http_request(remote.port, "POST", "/commands/to_next_slide", foreign))[0],
+            await handshake_status(remote.port, headers=foreign),
+            (await http_request(remote.port, "GET", "/state", own))[0],
+            await handshake_status(remote.port, headers=own),
+        ]
+
+    assert asyncio.run(scenario()) == [403, 403, 200, 101]
+    time.sleep(0.1)  # Longer than a render loop period
+    assert remote._navigator.state.cur is None  # The foreign command was not queued
+
+
+def test_token_is_required(video_markup_file: pathlib.Path):
+    navigator = Navigator(PresentationStructure.from_markup(Markup.from_yaml(video_markup_file)))
+    with pytest.raises(ValueError, match="requires a token"):
+        RemoteControl(navigator, host="0.0.0.0")
+
+    remote = RemoteControl(navigator, port=0, token="secret").open()
+
+    async def scenario() -> list[int]:
+        path = "/commands/to_next_slide"
+        return [
+            (await http_request(remote.port, "POST", path))[0],
+            (await http_request(remote.port, "POST", f"{path}?token=wrong"))[0],
+            (await http_request(remote.port, "POST", f"{path}?token=secret"))[0],
+            (await http_request(remote.port, "POST", path, {"Authorization": "Bearer secret"}))[0],
+            await handshake_status(remote.port),
+            await handshake_status(remote.port, "/ws?token=secret"),
+        ]
+
+    try:
+        assert asyncio.run(scenario()) == [401, 401, 202, 202, 401, 101]
+    finally:
+        remote.close()
+
+
+def test_close_with_connected_client(video_markup_file: pathlib.Path):
+    navigator = Navigator(PresentationStructure.from_markup(Markup.from_yaml(video_markup_file)))
+    remote = RemoteControl(navigator, port=0).open()
+
+    async def scenario() -> bytes:
+        client = await WebSocketClient().connect(remote.port)
+        await client.receive("state")
+        await asyncio.wait_for(asyncio.to_thread(remote.close), timeout=2)
+        return await asyncio.wait_for(client.reader.read(), timeout=1)
+
+    assert asyncio.run(scenario()) == b""
@@ -0,0 +1,28 @@
+import pathlib
+
+import pytest
+
+from anime_presenter.markup import Markup
+from anime_presenter.presentation import PresentationStructure
+from anime_presenter.video import VideoProbe, in_range_slides, out_of_range_slides, probe_video
+
+
+def test_probe_video(video_file: pathlib.Path):
+    probe = probe_video(video_file)
+
+    assert probe == VideoProbe(frame_count=60, fps=25.0, width=320, height=180)
+    assert probe.duration == 2.4
+    assert probe_video(video_file) is probe
+
+    video_file.write_bytes(b"")  # Identity changed, so the file is probed again
+    with pytest.raises(ValueError):
+        probe_video(video_file)
+
+
+def test_out_of_range_slides(video_markup_file: pathlib.Path):
+    markup = Markup.from_yaml(video_markup_file)
+    slides = PresentationStructure.from_markup(markup).get_all_slides()
+    probe = VideoProbe(frame_count=20, fps=25.0, width=320, height=180)
+
+    assert [s.full_id for s in out_of_range_slides(slides, probe)] == [(2, 1), (2, 2)]
+    assert [s.full_id for s in in_range_slides(slides, probe)] == [(1, 1), (1, 2)]